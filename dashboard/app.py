@@ -4,14 +4,25 @@ Real-time monitoring of data quality, anomalies, and AWS costs
 """
 
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
-import boto3
-from typing import Dict, List
+from concurrent.futures import ThreadPoolExecutor
+import boto3.session
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import functools
+import gc
+import hashlib
 import json
 import os
+import tempfile
+import threading
+import time
+
+import diskcache
+
+import aws_clients
 
 # Page configuration
 st.set_page_config(
@@ -24,6 +35,16 @@ st.set_page_config(
 # Check if running in demo/mock mode - DISABLED, always use real AWS
 MOCK_MODE = False
 
+def credential_scope(session: boto3.session.Session) -> str:
+    """
+    Identify the credentials a session signs with (profile + hashed access key
+    id) without an STS call, so cached responses are never shared across accounts
+    """
+    credentials = session.get_credentials()
+    access_key = credentials.access_key if credentials else ''
+    return f"{session.profile_name}:{hashlib.sha256(access_key.encode('utf-8')).hexdigest()[:16]}"
+
+
 # Initialize AWS clients
 @st.cache_resource
 def get_aws_clients():
@@ -34,32 +55,32 @@ def get_aws_clients():
     try:
         # Check if running on Streamlit Cloud with secrets
         if 'AWS_ACCESS_KEY_ID' in st.secrets:
-            import boto3.session
             session = boto3.session.Session(
                 aws_access_key_id=st.secrets['AWS_ACCESS_KEY_ID'],
                 aws_secret_access_key=st.secrets['AWS_SECRET_ACCESS_KEY'],
                 region_name=aws_region
             )
+        elif aws_region == aws_clients.AWS_REGION:
+            # Reuse the shared default credential chain session and clients
+            return {
+                's3': aws_clients.S3,
+                'cloudwatch': aws_clients.CW,
+                'athena': aws_clients.ATHENA,
+                'region': aws_region,
+                'identity': credential_scope(aws_clients.SESSION),
+            }
         else:
             # Use default credential chain (local AWS CLI credentials)
-            import boto3.session
             session = boto3.session.Session(region_name=aws_region)
         
-        clients = {
-            's3': session.client('s3'),
-            'cloudwatch': session.client('cloudwatch'),
-            'athena': session.client('athena'),
+        return {
+            's3': session.client('s3', config=aws_clients.CLIENT_CONFIG),
+            'cloudwatch': session.client('cloudwatch', config=aws_clients.CLIENT_CONFIG),
+            'athena': session.client('athena', config=aws_clients.CLIENT_CONFIG),
+            'region': aws_region,
+            'identity': credential_scope(session),
         }
         
-        # Test connection
-        try:
-            clients['cloudwatch'].list_metrics(Namespace='DQAD/DataQuality', MaxRecords=1)
-            st.success(f"🟢 Connected to AWS (Region: {aws_region})")
-        except:
-            st.info(f"🟡 AWS clients created for region: {aws_region}")
-        
-        return clients
-        
     except Exception as e:
         st.error(f"⚠️ Could not create AWS clients: {str(e)}")
         st.warning("Dashboard will show limited data. Check AWS credentials.")
@@ -72,206 +93,361 @@ ENVIRONMENT = "dev"
 S3_PROCESSED_BUCKET = f"{PROJECT_NAME}-processed-{ENVIRONMENT}"
 CLOUDWATCH_NAMESPACE_DQ = "DQAD/DataQuality"
 CLOUDWATCH_NAMESPACE_COST = "DQAD/Cost"
+CACHE_TTL_SECONDS = 300  # Matches the 5 minute refresh noted in the footer
+LATEST_SOURCE_FILE_KEY = "_latest.txt"  # Written by the Glue job after each file run
+MAX_CHART_POINTS = 500  # Keeps Plotly payloads small for the 30 day range
+
+# On-disk cache shared across sessions and process restarts
+DISK_CACHE = diskcache.Cache(os.path.join(tempfile.gettempdir(), 'dqad_cache'))
+
+# Fetchers run on worker threads, so instead of calling st.* they return
+# (level, message) notices that the main script renders after .result()
+Notice = Tuple[str, str]
 
+# Resolve clients once per rerun instead of inside every fetch helper
+AWS_CLIENTS = get_aws_clients()
+cw = AWS_CLIENTS['cloudwatch'] if AWS_CLIENTS else None
+s3 = AWS_CLIENTS['s3'] if AWS_CLIENTS else None
 
-def fetch_cloudwatch_metrics(namespace: str, metric_name: str, hours: int = 24) -> pd.DataFrame:
+
+def requires_cw(default_factory: Callable[[], Any]):
     """
-    Fetch CloudWatch metrics for the specified time period
-    Returns mock data if AWS clients are not available
+    Return (default_factory(), no notices) instead of calling the fetcher when
+    the CloudWatch client could not be created (user will see warning at top)
     """
-    clients = get_aws_clients()
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if cw is None:
+                return default_factory(), []
+            return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def empty_anomaly_summary() -> Dict:
+    """Zeroed summary used when metrics are unavailable"""
+    return {
+        'total_anomalies': 0,
+        'data_quality_issues': 0,
+        'total_records': 0,
+        'gold_records': 0,
+        'dq_score': 0
+    }
+
+
+def mock_cost_summary() -> Dict:
+    """Cost summary shown when AWS clients couldn't be initialized (mock mode)"""
+    return {
+        'current_daily_cost': 0.45,
+        'avg_daily_cost': 0.38,
+        'projected_monthly': 13.50
+    }
+
+
+def metric_query(query_id: str, namespace: str, metric_name: str, stat: str,
+                 period: int, dimensions: List[Dict]) -> Dict:
+    """
+    Build a single GetMetricData query entry
+    """
+    return {
+        'Id': query_id,
+        'MetricStat': {
+            'Metric': {
+                'Namespace': namespace,
+                'MetricName': metric_name,
+                'Dimensions': dimensions
+            },
+            'Period': period,
+            'Stat': stat
+        }
+    }
+
+
+def batch_get_metrics(queries: List[Dict], start_time: datetime, end_time: datetime) -> Dict[str, pd.DataFrame]:
+    """
+    Fetch several metrics with one GetMetricData call
+    Returns a Timestamp/Value DataFrame per query Id, oldest first
+    """
+    # Key on the region and credentials, the query shape, window length and a
+    # TTL-sized time bucket so repeated renders within the bucket reuse the
+    # same response, but switching region or account never does. This is the
+    # only cache in front of CloudWatch (the metric fetchers are not
+    # st.cache_data wrapped), so data is never more than one TTL old
+    window_seconds = int((end_time - start_time).total_seconds())
+    now = time.time()
+    time_bucket = int(now) // CACHE_TTL_SECONDS
+    cache_key = (f"{AWS_CLIENTS['region']}:{AWS_CLIENTS['identity']}:"
+                 f"{json.dumps(queries, sort_keys=True)}:{window_seconds}:{time_bucket}")
     
-    # Return empty if clients not available (user will see warning at top)
-    if clients is None:
-        return pd.DataFrame()
+    frames = DISK_CACHE.get(cache_key)
+    if frames is not None:
+        return frames
     
-    cw = clients['cloudwatch']
+    timestamps = {query['Id']: [] for query in queries}
+    values = {query['Id']: [] for query in queries}
+    
+    # Results for one query may be split across pages; CloudWatch returns
+    # them oldest first so no client-side sort is needed
+    paginator = cw.get_paginator('get_metric_data')
+    pages = paginator.paginate(
+        MetricDataQueries=queries,
+        StartTime=start_time,
+        EndTime=end_time,
+        ScanBy='TimestampAscending'
+    )
+    for page in pages:
+        for result in page['MetricDataResults']:
+            timestamps[result['Id']].extend(result['Timestamps'])
+            values[result['Id']].extend(result['Values'])
     
+    frames = {
+        query_id: pd.DataFrame({'Timestamp': timestamps[query_id], 'Value': values[query_id]})
+        for query_id in timestamps
+    }
+    # Expire with the bucket rather than a full TTL after it was written
+    DISK_CACHE.set(cache_key, frames, expire=CACHE_TTL_SECONDS - now % CACHE_TTL_SECONDS)
+    
+    return frames
+
+
+def downsample_for_chart(df: pd.DataFrame, max_points: int = MAX_CHART_POINTS) -> pd.DataFrame:
+    """
+    Thin a dense series to at most roughly max_points rows before plotting
+    """
+    if len(df) <= max_points:
+        return df
+    return df.iloc[::-(-len(df) // max_points)]
+
+
+@requires_cw(dict)
+def fetch_trend_metrics(hours: int = 24) -> Tuple[Dict[str, pd.DataFrame], List[Notice]]:
+    """
+    Fetch the anomaly, cost and DQ score trend series for the specified time period
+    """
     end_time = datetime.now()
     start_time = end_time - timedelta(hours=hours)
     
+    # Query metrics with correct dimension (SourceFile for aggregated claims data)
+    dimensions = [{'Name': 'SourceFile', 'Value': 'claims/'}]
+    queries = [
+        metric_query('anom_trend', CLOUDWATCH_NAMESPACE_DQ, 'AnomalyCount', 'Sum', 3600, dimensions),
+        metric_query('cost_trend', CLOUDWATCH_NAMESPACE_COST, 'DailyCost', 'Maximum', 3600, dimensions),
+        metric_query('dq_trend', CLOUDWATCH_NAMESPACE_DQ, 'DataQualityScore', 'Average', 3600, dimensions),
+    ]
+    
     try:
-        # Query metrics with correct dimension (SourceFile for aggregated claims data)
-        response = cw.get_metric_statistics(
-            Namespace=namespace,
-            MetricName=metric_name,
-            Dimensions=[
-                {'Name': 'SourceFile', 'Value': 'claims/'}
-            ],
-            StartTime=start_time,
-            EndTime=end_time,
-            Period=3600,  # 1 hour
-            Statistics=['Sum', 'Maximum'] if metric_name == 'AnomalyCount' else ['Average', 'Maximum', 'Minimum']
-        )
-        
-        if not response['Datapoints']:
-            st.info(f"No CloudWatch data found for {metric_name} in last {hours} hours. Run full_demo.ps1 to generate data.")
-            return pd.DataFrame()
-        
-        df = pd.DataFrame(response['Datapoints'])
-        df = df.sort_values('Timestamp')
-        
-        # Rename Sum to Average for consistency (AnomalyCount uses Sum)
-        if 'Sum' in df.columns:
-            df['Average'] = df['Sum']
-        
-        return df
-        
+        frames = batch_get_metrics(queries, start_time, end_time)
+        return {query_id: downsample_for_chart(df) for query_id, df in frames.items()}, []
     except Exception as e:
-        st.error(f"Error fetching {metric_name} from {namespace}: {str(e)}")
-        return pd.DataFrame()
+        return {}, [('error', f"Error fetching trend metrics: {str(e)}")]
 
 
-def fetch_anomaly_summary() -> Dict:
+@st.cache_data(ttl=CACHE_TTL_SECONDS)
+def fetch_latest_source_file() -> Optional[str]:
     """
-    Fetch summary statistics from CloudWatch metrics
+    Read the key of the most recently processed file from the processed bucket
     """
-    clients = get_aws_clients()
+    if s3 is None:
+        return None
     
-    if clients is None:
-        return {
-            'total_anomalies': 0, 
-            'data_quality_issues': 0,
-            'total_records': 0,
-            'gold_records': 0,
-            'dq_score': 0
-        }
+    # Only a missing marker means "no runs yet"; AccessDenied, a missing bucket
+    # or throttling propagate (st.cache_data does not cache exceptions) so
+    # load_anomaly_summary can report them
+    try:
+        response = s3.get_object(Bucket=S3_PROCESSED_BUCKET, Key=LATEST_SOURCE_FILE_KEY)
+    except s3.exceptions.NoSuchKey:
+        return None
+    return response['Body'].read().decode('utf-8').strip() or None
+
+
+def fetch_anomaly_summary(source_file: str) -> Dict:
+    """
+    Fetch summary statistics for one processed file from CloudWatch metrics
+    Errors propagate so load_anomaly_summary can report them
+    """
+    # Get metrics from last 7 days
+    end_time = datetime.now()
+    start_time = end_time - timedelta(days=7)
     
-    cw = clients['cloudwatch']
+    # Query metrics for this specific file
+    metrics_to_fetch = {
+        'AnomalyCount': 'total_anomalies',
+        'SilverRecords': 'data_quality_issues',
+        'TotalRecords': 'total_records',
+        'GoldRecords': 'gold_records'
+    }
     
-    try:
-        # Get metrics from last 7 days
-        end_time = datetime.now()
-        start_time = end_time - timedelta(days=7)
-        
-        # List all metrics to find the most recent file
-        all_metrics = cw.list_metrics(
-            Namespace=CLOUDWATCH_NAMESPACE_DQ,
-            MetricName='TotalRecords'
-        )
-        
-        # Get the most recent file dimension (not the aggregated 'claims/')
-        file_dimensions = [m for m in all_metrics['Metrics'] 
-                          if m['Dimensions'] 
-                          and m['Dimensions'][0]['Value'] != 'claims/'
-                          and 'payer_claims' in m['Dimensions'][0]['Value']]
-        
-        if not file_dimensions:
-            st.info("No recent Glue runs found. Run full_demo.ps1 to generate data.")
-            return {
-                'total_anomalies': 0, 
-                'data_quality_issues': 0,
-                'total_records': 0,
-                'gold_records': 0,
-                'dq_score': 0
-            }
-        
-        # Use the first file we find (most recent based on metric existence)
-        source_file = file_dimensions[0]['Dimensions'][0]['Value']
-        st.caption(f"📊 Showing metrics from: {source_file}")
-        
-        # Query metrics for this specific file
-        metrics_to_fetch = {
-            'AnomalyCount': 'total_anomalies',
-            'SilverRecords': 'data_quality_issues',
-            'TotalRecords': 'total_records',
-            'GoldRecords': 'gold_records'
-        }
-        
-        results = {}
-        for metric_name, result_key in metrics_to_fetch.items():
-            response = cw.get_metric_statistics(
-                Namespace=CLOUDWATCH_NAMESPACE_DQ,
-                MetricName=metric_name,
-                Dimensions=[{'Name': 'SourceFile', 'Value': source_file}],
-                StartTime=start_time,
-                EndTime=end_time,
-                Period=3600,
-                Statistics=['Maximum']
-            )
-            
-            if response['Datapoints']:
-                latest = max(response['Datapoints'], key=lambda x: x['Timestamp'])
-                results[result_key] = int(latest['Maximum'])
-            else:
-                results[result_key] = 0
-        
-        # Calculate DQ score
-        total = results.get('total_records', 0)
-        gold = results.get('gold_records', 0)
-        dq_score = (gold / total * 100) if total > 0 else 0
-        
-        return {
-            'total_anomalies': results.get('total_anomalies', 0),
-            'data_quality_issues': results.get('data_quality_issues', 0),
-            'total_records': results.get('total_records', 0),
-            'gold_records': results.get('gold_records', 0),
-            'dq_score': dq_score
-        }
-        
-    except Exception as e:
-        st.error(f"Error fetching metrics: {str(e)}")
-        return {
-            'total_anomalies': 0, 
-            'data_quality_issues': 0,
-            'total_records': 0,
-            'gold_records': 0,
-            'dq_score': 0
-        }
+    # Fetch all four metrics in a single GetMetricData round-trip
+    dimensions = [{'Name': 'SourceFile', 'Value': source_file}]
+    queries = [
+        metric_query(result_key, CLOUDWATCH_NAMESPACE_DQ, metric_name, 'Maximum', 3600, dimensions)
+        for metric_name, result_key in metrics_to_fetch.items()
+    ]
+    frames = batch_get_metrics(queries, start_time, end_time)
+    
+    results = {}
+    for result_key, df in frames.items():
+        results[result_key] = int(df['Value'].iloc[-1]) if not df.empty else 0
+    
+    # Calculate DQ score
+    total = results.get('total_records', 0)
+    gold = results.get('gold_records', 0)
+    dq_score = (gold / total * 100) if total > 0 else 0
+    
+    return {
+        'total_anomalies': results.get('total_anomalies', 0),
+        'data_quality_issues': results.get('data_quality_issues', 0),
+        'total_records': results.get('total_records', 0),
+        'gold_records': results.get('gold_records', 0),
+        'dq_score': dq_score
+    }
 
 
-def fetch_cost_summary() -> Dict:
+def load_anomaly_summary() -> Tuple[Dict, List[Notice]]:
     """
-    Fetch cost summary from CloudWatch
+    Resolve the latest processed file and fetch its summary
+    Not cached itself, so errors become notices on every rerun instead of
+    being cached for the TTL; only successful lookups are cached
     """
-    clients = get_aws_clients()
+    if cw is None:
+        return empty_anomaly_summary(), []
     
-    # Handle case where AWS clients couldn't be initialized (mock mode)
-    if clients is None:
-        return {
-            'current_daily_cost': 0.45,
-            'avg_daily_cost': 0.38,
-            'projected_monthly': 13.50
-        }
+    # Most recently processed file, as recorded by the Glue job
+    try:
+        source_file = fetch_latest_source_file()
+    except Exception as e:
+        return empty_anomaly_summary(), [
+            ('error', f"Could not read s3://{S3_PROCESSED_BUCKET}/{LATEST_SOURCE_FILE_KEY}: {str(e)}")
+        ]
     
-    cw = clients['cloudwatch']
+    if not source_file:
+        return empty_anomaly_summary(), [('info', "No recent Glue runs found. Run full_demo.ps1 to generate data.")]
     
+    try:
+        summary = fetch_anomaly_summary(source_file)
+    except Exception as e:
+        return empty_anomaly_summary(), [('error', f"Error fetching metrics: {str(e)}")]
+    
+    return summary, [('caption', f"📊 Showing metrics from: {source_file}")]
+
+
+@requires_cw(mock_cost_summary)
+def fetch_cost_summary() -> Tuple[Dict, List[Notice]]:
+    """
+    Fetch cost summary from CloudWatch
+    """
     try:
         # Get latest daily cost (EstimatedDailyCost metric from cost_collector Lambda)
-        response = cw.get_metric_statistics(
-            Namespace=CLOUDWATCH_NAMESPACE_COST,
-            MetricName='EstimatedDailyCost',
-            StartTime=datetime.now() - timedelta(days=7),
-            EndTime=datetime.now(),
-            Period=86400,  # 1 day
-            Statistics=['Maximum']
-        )
+        end_time = datetime.now()
+        queries = [
+            metric_query('daily_cost', CLOUDWATCH_NAMESPACE_COST, 'EstimatedDailyCost', 'Maximum', 86400, [])
+        ]
+        cost_df = batch_get_metrics(queries, end_time - timedelta(days=7), end_time)['daily_cost']
         
-        if response['Datapoints']:
-            latest = sorted(response['Datapoints'], key=lambda x: x['Timestamp'], reverse=True)[0]
-            current_cost = latest['Maximum']
+        if not cost_df.empty:
+            current_cost = cost_df['Value'].iloc[-1]
         else:
             # Fallback: estimate based on typical Glue costs
             current_cost = 0.02  # $0.02/day typical
         
         # Calculate 7-day average
-        total = sum(dp['Maximum'] for dp in response['Datapoints'])
-        avg_cost = total / len(response['Datapoints']) if response['Datapoints'] else current_cost
+        avg_cost = cost_df['Value'].mean() if not cost_df.empty else current_cost
         
         return {
             'current_daily_cost': current_cost,
             'avg_daily_cost': avg_cost,
             'projected_monthly': current_cost * 30
-        }
+        }, []
         
     except Exception as e:
         # Provide realistic estimate if cost collector not running
-        st.info(f"Cost data unavailable (cost_collector Lambda may not be running). Using estimate.")
         return {
             'current_daily_cost': 0.02,
             'avg_daily_cost': 0.02,
             'projected_monthly': 0.60
-        }
+        }, [('info', "Cost data unavailable (cost_collector Lambda may not be running). Using estimate.")]
+
+
+@st.cache_resource
+def get_fetch_executor() -> ThreadPoolExecutor:
+    """
+    Thread pool for the concurrent CloudWatch fetches, shared by every rerun
+    and session instead of being created per rerun
+    """
+    return ThreadPoolExecutor(max_workers=3, thread_name_prefix='dqad-fetch')
+
+
+def submit_fetch(fetch: Callable, *args):
+    """
+    Run a fetcher on the shared pool with this rerun's script context
+    attached (st.cache_data expects one; the fetchers themselves never call st.*)
+    """
+    script_ctx = get_script_run_ctx()
+    
+    def run():
+        add_script_run_ctx(threading.current_thread(), script_ctx)
+        return fetch(*args)
+    
+    return get_fetch_executor().submit(run)
+
+
+def render_notices(notices: List[Notice]):
+    """Render fetcher notices on the main script thread"""
+    for level, message in notices:
+        getattr(st, level)(message)
+
+
+@st.cache_resource
+def get_alerts_df() -> pd.DataFrame:
+    """
+    Build the static alerts table once per process
+    The script body reruns on every interaction, so module-level code is not enough
+    """
+    # Column-oriented so pandas can build the frame without per-row key lookups
+    return pd.DataFrame({
+        'Timestamp': ['2024-12-04 14:23:15', '2024-12-04 12:15:42', '2024-12-04 09:30:21'],
+        'Type': ['Cost Spike', 'Anomaly Spike', 'Data Quality'],
+        'Severity': ['High', 'Medium', 'Low'],
+        'Message': [
+            'Daily cost exceeded $50 threshold',
+            '145 anomalies detected in latest batch',
+            'DQ score dropped to 94.2%'
+        ],
+        'Action': ['Cluster scaled down to 1 worker', 'Data quarantined, job restarted', 'Monitoring'],
+        'Status': ['✅ Resolved', '✅ Resolved', '👁️ Watching']
+    })
+
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS)
+def build_mock_dq_chart() -> go.Figure:
+    """
+    Build the demo DQ score chart shown when no CloudWatch data exists
+    """
+    mock_times = pd.date_range(end=datetime.now(), periods=24, freq='h')
+    mock_scores = [95.2, 94.8, 96.1, 95.5, 94.9, 95.8, 96.2, 95.1, 94.7, 95.9,
+                   96.3, 95.4, 94.6, 95.7, 96.0, 95.3, 94.9, 95.6, 96.1, 95.2,
+                   94.8, 95.5, 96.0, 95.7]
+    
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=mock_times,
+        y=mock_scores,
+        mode='lines+markers',
+        name='DQ Score',
+        line=dict(color='#2ECC71', width=3),
+        fill='tozeroy'
+    ))
+    
+    fig.add_hline(y=95, line_dash="dash", line_color="orange", annotation_text="Target: 95%")
+    fig.update_layout(
+        title="Data Quality Score Over Time (Demo Data)",
+        xaxis_title="Time",
+        yaxis_title="Score (%)",
+        yaxis_range=[90, 100]
+    )
+    
+    return fig
 
 
 # Dashboard Header
@@ -300,7 +476,9 @@ with st.sidebar:
     
     st.header("📋 Quick Actions")
     if st.button("🔄 Refresh Data", use_container_width=True):
-        st.cache_data.clear()
+        # Only invalidate the S3 marker and CloudWatch responses, not every cached value
+        fetch_latest_source_file.clear()
+        DISK_CACHE.clear()
         st.rerun()
     
     if st.button("📥 Export Report", use_container_width=True):
@@ -311,11 +489,37 @@ with st.sidebar:
 
 # Main Dashboard
 
+# Test connection once per session rather than on every rerun; a single
+# GetMetricData query over the last minute returns almost nothing but still
+# exercises credentials, region and the permission the dashboard relies on
+if AWS_CLIENTS is not None and 'aws_tested' not in st.session_state:
+    try:
+        probe_end = datetime.now()
+        cw.get_metric_data(
+            MetricDataQueries=[
+                metric_query('probe', CLOUDWATCH_NAMESPACE_DQ, 'TotalRecords', 'Maximum', 60,
+                             [{'Name': 'SourceFile', 'Value': 'claims/'}])
+            ],
+            StartTime=probe_end - timedelta(minutes=1),
+            EndTime=probe_end
+        )
+        st.success(f"🟢 Connected to AWS (Region: {AWS_CLIENTS['region']})")
+    except Exception:
+        st.info(f"🟡 AWS clients created for region: {AWS_CLIENTS['region']}")
+    st.session_state['aws_tested'] = True
+
+# Kick off all independent CloudWatch fetches concurrently on the shared pool
+anomaly_summary_future = submit_fetch(load_anomaly_summary)
+cost_summary_future = submit_fetch(fetch_cost_summary)
+trend_metrics_future = submit_fetch(fetch_trend_metrics, selected_hours)
+
 # Row 1: Key Metrics
 col1, col2, col3, col4 = st.columns(4)
 
-anomaly_summary = fetch_anomaly_summary()
-cost_summary = fetch_cost_summary()
+anomaly_summary, anomaly_notices = anomaly_summary_future.result()
+cost_summary, cost_notices = cost_summary_future.result()
+trend_metrics, trend_notices = trend_metrics_future.result()
+render_notices(anomaly_notices + cost_notices + trend_notices)
 
 with col1:
     st.metric(
@@ -358,13 +562,16 @@ with col1:
     st.subheader("📉 Anomaly Trend (24h)")
     
     # Fetch anomaly count metrics
-    anomaly_df = fetch_cloudwatch_metrics(CLOUDWATCH_NAMESPACE_DQ, 'AnomalyCount', selected_hours)
+    anomaly_df = trend_metrics.get('anom_trend', pd.DataFrame())
     
     if not anomaly_df.empty:
+        # plotly.express is only needed when there is trend data to draw
+        import plotly.express as px
+        
         fig = px.line(
             anomaly_df,
             x='Timestamp',
-            y='Average',
+            y='Value',
             title='Anomaly Count Over Time'
         )
         fig.update_layout(
@@ -380,13 +587,15 @@ with col2:
     st.subheader("💵 Cost Trend (24h)")
     
     # Fetch cost metrics
-    cost_df = fetch_cloudwatch_metrics(CLOUDWATCH_NAMESPACE_COST, 'DailyCost', selected_hours)
+    cost_df = trend_metrics.get('cost_trend', pd.DataFrame())
     
     if not cost_df.empty:
+        import plotly.express as px
+        
         fig = px.area(
             cost_df,
             x='Timestamp',
-            y='Maximum',
+            y='Value',
             title='AWS Cost Over Time'
         )
         fig.update_layout(
@@ -444,14 +653,14 @@ with col1:
     st.subheader("✅ Data Quality Score Trend")
     
     # Fetch DQ score metrics
-    dq_score_df = fetch_cloudwatch_metrics(CLOUDWATCH_NAMESPACE_DQ, 'DataQualityScore', selected_hours)
+    dq_score_df = trend_metrics.get('dq_trend', pd.DataFrame())
     
     if not dq_score_df.empty:
         fig = go.Figure()
         
         fig.add_trace(go.Scatter(
             x=dq_score_df['Timestamp'],
-            y=dq_score_df['Average'],
+            y=dq_score_df['Value'],
             mode='lines+markers',
             name='DQ Score',
             line=dict(color='#2ECC71', width=3),
@@ -476,30 +685,7 @@ with col1:
         st.plotly_chart(fig, use_container_width=True)
     else:
         # Show mock data for demo
-        mock_times = pd.date_range(end=datetime.now(), periods=24, freq='h')
-        mock_scores = [95.2, 94.8, 96.1, 95.5, 94.9, 95.8, 96.2, 95.1, 94.7, 95.9,
-                      96.3, 95.4, 94.6, 95.7, 96.0, 95.3, 94.9, 95.6, 96.1, 95.2,
-                      94.8, 95.5, 96.0, 95.7]
-        
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=mock_times,
-            y=mock_scores,
-            mode='lines+markers',
-            name='DQ Score',
-            line=dict(color='#2ECC71', width=3),
-            fill='tozeroy'
-        ))
-        
-        fig.add_hline(y=95, line_dash="dash", line_color="orange", annotation_text="Target: 95%")
-        fig.update_layout(
-            title="Data Quality Score Over Time (Demo Data)",
-            xaxis_title="Time",
-            yaxis_title="Score (%)",
-            yaxis_range=[90, 100]
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(build_mock_dq_chart(), use_container_width=True)
 
 with col2:
     st.subheader("🎯 Current Score")
@@ -535,39 +721,16 @@ with col2:
     fig.update_layout(height=300)
     st.plotly_chart(fig, use_container_width=True)
 
+# Charts are serialized once written, so drop the figure and trend frames
+# rather than holding them in module globals until the next rerun
+del fig, anomaly_df, cost_df, dq_score_df, trend_metrics
+
 st.divider()
 
 # Row 5: Recent Alerts
 st.subheader("🚨 Recent Alerts & Actions")
 
-alerts_data = [
-    {
-        'Timestamp': '2024-12-04 14:23:15',
-        'Type': 'Cost Spike',
-        'Severity': 'High',
-        'Message': 'Daily cost exceeded $50 threshold',
-        'Action': 'Cluster scaled down to 1 worker',
-        'Status': '✅ Resolved'
-    },
-    {
-        'Timestamp': '2024-12-04 12:15:42',
-        'Type': 'Anomaly Spike',
-        'Severity': 'Medium',
-        'Message': '145 anomalies detected in latest batch',
-        'Action': 'Data quarantined, job restarted',
-        'Status': '✅ Resolved'
-    },
-    {
-        'Timestamp': '2024-12-04 09:30:21',
-        'Type': 'Data Quality',
-        'Severity': 'Low',
-        'Message': 'DQ score dropped to 94.2%',
-        'Action': 'Monitoring',
-        'Status': '👁️ Watching'
-    }
-]
-
-alerts_df = pd.DataFrame(alerts_data)
+alerts_df = get_alerts_df()
 
 st.dataframe(
     alerts_df,
@@ -587,3 +750,6 @@ st.divider()
 
 # Footer
 st.caption("DQAD Dashboard v1.0 | Data refreshes every 5 minutes | Powered by AWS Glue")
+
+# Reclaim per-rerun garbage so long-running sessions keep a flat memory profile
+gc.collect()
@@ -0,0 +1,19 @@
+"""
+Shared AWS session and clients for the dashboard and helper scripts
+Created once at import so service models are only loaded a single time
+"""
+
+import os
+import boto3.session
+from botocore.config import Config
+
+AWS_REGION = os.getenv('AWS_DEFAULT_REGION', 'us-east-1')
+
+# Adaptive retries back off on CloudWatch throttling during concurrent fetches
+CLIENT_CONFIG = Config(retries={'max_attempts': 10, 'mode': 'adaptive'})
+
+# Default credential chain (local AWS CLI credentials or environment)
+SESSION = boto3.session.Session(region_name=AWS_REGION)
+CW = SESSION.client('cloudwatch', config=CLIENT_CONFIG)
+S3 = SESSION.client('s3', config=CLIENT_CONFIG)
+ATHENA = SESSION.client('athena', config=CLIENT_CONFIG)
@@ -1,8 +1,7 @@
 """Quick script to check CloudWatch metrics"""
-import boto3
 from datetime import datetime, timedelta
 
-cw = boto3.client('cloudwatch', region_name='us-east-1')
+from aws_clients import CW as cw
 
 # Check metrics from last 7 days
 end_time = datetime.now()
@@ -12,20 +11,46 @@ print("Checking CloudWatch metrics...")
 print(f"Time range: {start_time} to {end_time}")
 print("=" * 60)
 
-# Check TotalRecords with aggregated dimension
-response = cw.get_metric_statistics(
-    Namespace='DQAD/DataQuality',
-    MetricName='TotalRecords',
-    Dimensions=[{'Name': 'SourceFile', 'Value': 'claims/'}],
+# Fetch TotalRecords and AnomalyCount for the aggregated dimension in one call
+aggregated_dimension = [{'Name': 'SourceFile', 'Value': 'claims/'}]
+response = cw.get_metric_data(
+    MetricDataQueries=[
+        {
+            'Id': 'total',
+            'MetricStat': {
+                'Metric': {
+                    'Namespace': 'DQAD/DataQuality',
+                    'MetricName': 'TotalRecords',
+                    'Dimensions': aggregated_dimension
+                },
+                'Period': 3600,
+                'Stat': 'Maximum'
+            }
+        },
+        {
+            'Id': 'anom',
+            'MetricStat': {
+                'Metric': {
+                    'Namespace': 'DQAD/DataQuality',
+                    'MetricName': 'AnomalyCount',
+                    'Dimensions': aggregated_dimension
+                },
+                'Period': 3600,
+                'Stat': 'Maximum'
+            }
+        }
+    ],
     StartTime=start_time,
     EndTime=end_time,
-    Period=3600,
-    Statistics=['Maximum']
+    ScanBy='TimestampDescending'
 )
+results = {result['Id']: result for result in response['MetricDataResults']}
 
-print(f"\nTotalRecords (claims/ dimension): {len(response['Datapoints'])} datapoints")
-for dp in sorted(response['Datapoints'], key=lambda x: x['Timestamp'], reverse=True)[:3]:
-    print(f"  {dp['Timestamp']}: {dp['Maximum']}")
+# Check TotalRecords with aggregated dimension (newest first)
+total = results['total']
+print(f"\nTotalRecords (claims/ dimension): {len(total['Timestamps'])} datapoints")
+for timestamp, value in zip(total['Timestamps'][:3], total['Values'][:3]):
+    print(f"  {timestamp}: {value}")
 
 # Check for individual file metrics
 response2 = cw.list_metrics(
@@ -39,16 +64,7 @@ for metric in response2['Metrics'][:5]:
     print(f"  Dimensions: {dims}")
 
 # Check AnomalyCount
-response3 = cw.get_metric_statistics(
-    Namespace='DQAD/DataQuality',
-    MetricName='AnomalyCount',
-    Dimensions=[{'Name': 'SourceFile', 'Value': 'claims/'}],
-    StartTime=start_time,
-    EndTime=end_time,
-    Period=3600,
-    Statistics=['Maximum']
-)
-
-print(f"\nAnomalyCount (claims/ dimension): {len(response3['Datapoints'])} datapoints")
-for dp in sorted(response3['Datapoints'], key=lambda x: x['Timestamp'], reverse=True)[:3]:
-    print(f"  {dp['Timestamp']}: {dp['Maximum']}")
+anom = results['anom']
+print(f"\nAnomalyCount (claims/ dimension): {len(anom['Timestamps'])} datapoints")
+for timestamp, value in zip(anom['Timestamps'][:3], anom['Values'][:3]):
+    print(f"  {timestamp}: {value}")
@@ -3,12 +3,14 @@ Synthetic Payer Claims Data Generator
 Generates realistic healthcare payer claims data for DQAD testing
 """
 
-import csv
+import os
 import random
 import uuid
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Union
+import numpy as np
+import pandas as pd
 from faker import Faker
 
 # Initialize Faker
@@ -17,7 +19,7 @@ Faker.seed(42)
 random.seed(42)
 
 # Healthcare-specific code lists
-CPT_CODES = [
+CPT_CODES = (
     "99213", "99214", "99215", "99203", "99204", "99205",  # Office visits
     "99284", "99285", "99283", "99282",  # Emergency room
     "45378", "45380", "45385",  # Colonoscopy
@@ -29,9 +31,9 @@ CPT_CODES = [
     "36415", "36416",  # Venipuncture
     "90471", "90472",  # Immunization admin
     "J3301", "J1100", "J2001",  # Drug codes
-]
+)
 
-ICD10_CODES = [
+ICD10_CODES = (
     "E11.9",   # Type 2 diabetes without complications
     "I10",     # Essential hypertension
     "E78.5",   # Hyperlipidemia
@@ -52,9 +54,9 @@ ICD10_CODES = [
     "H35.30",  # Macular degeneration
     "N18.3",   # Chronic kidney disease
     "C50.919", # Breast cancer
-]
+)
 
-DENIAL_REASONS = [
+DENIAL_REASONS = (
     "Prior authorization required",
     "Service not covered",
     "Duplicate claim",
@@ -65,10 +67,88 @@ DENIAL_REASONS = [
     "Missing documentation",
     "Timely filing limit exceeded",
     "Incorrect billing code",
+)
+
+CLAIM_STATUSES = ("PAID", "DENIED", "PENDING")
+CLAIM_STATUS_WEIGHTS = (0.75, 0.15, 0.10)  # 75% paid, 15% denied, 10% pending
+GENDERS = ("M", "F", "U")  # Male, Female, Unknown
+
+# Claim amount ranges by CPT prefix (first match wins)
+CLAIM_AMOUNT_RANGES = [
+    (("99",), 100, 500),        # Office/ER visits
+    (("45",), 1000, 5000),      # Procedures
+    (("93",), 200, 1500),       # Cardiac tests
+    (("80", "85"), 50, 300),    # Labs
+    (("70", "71"), 500, 3000),  # Imaging
+    (("77",), 200, 800),        # Mammography
+    (("36",), 25, 100),         # Blood draw
+    (("90",), 30, 150),         # Vaccines
+    (("J",), 100, 5000),        # Drugs
+]
+DEFAULT_CLAIM_AMOUNT_RANGE = (100, 1000)
+
+
+def _claim_amount_range(cpt_code: str) -> tuple:
+    """Resolve the (low, high) claim amount range for a CPT code by prefix"""
+    for prefixes, low, high in CLAIM_AMOUNT_RANGES:
+        if cpt_code.startswith(prefixes):
+            return low, high
+    return DEFAULT_CLAIM_AMOUNT_RANGE
+
+
+# NumPy copies of the code lists, built once for the vectorized batch draws
+CPT_CODES_ARR = np.array(CPT_CODES)
+ICD10_CODES_ARR = np.array(ICD10_CODES)
+DENIAL_REASONS_ARR = np.array(DENIAL_REASONS)
+CLAIM_STATUSES_ARR = np.array(CLAIM_STATUSES)
+GENDERS_ARR = np.array(GENDERS)
+
+# Prefix ladder resolved once for every known code; arrays are indexed by
+# position in CPT_CODES for the vectorized batch draw
+CPT_AMOUNT_RANGES = {code: _claim_amount_range(code) for code in CPT_CODES}
+CPT_AMOUNT_LOW = np.array([CPT_AMOUNT_RANGES[code][0] for code in CPT_CODES], dtype=float)
+CPT_AMOUNT_HIGH = np.array([CPT_AMOUNT_RANGES[code][1] for code in CPT_CODES], dtype=float)
+
+ANOMALY_TYPES = (
+    "invalid_npi",
+    "negative_amount",
+    "future_date",
+    "invalid_cpt",
+    "missing_diagnosis",
+    "duplicate_claim",
+    "excessive_amount",
+)
+ANOMALY_TYPES_ARR = np.array(ANOMALY_TYPES)
+
+CLAIM_FIELDNAMES = [
+    "claim_id", "member_id", "provider_id", "provider_npi",
+    "cpt_code", "icd10_code", "claim_amount", "service_date",
+    "submission_date", "claim_status", "denial_reason",
+    "patient_dob", "patient_zip", "patient_gender"
 ]
 
-CLAIM_STATUSES = ["PAID", "DENIED", "PENDING"]
-GENDERS = ["M", "F", "U"]  # Male, Female, Unknown
+# Patient ages drawn for generated claims (same range as Faker's date_of_birth)
+PATIENT_MIN_AGE = 18
+PATIENT_MAX_AGE = 90
+ZIP_POOL_SIZE = 5000  # Faker ZIP codes drawn once and resampled per batch
+
+CSV_WRITE_BUFFER_SIZE = 1 << 20  # 1 MiB file buffer for save_to_csv
+CSV_WRITE_CHUNK_ROWS = 50000  # Rows formatted per to_csv chunk
+
+# Hex digit positions within the dashed 8-4-4-4-12 UUID string
+UUID_HEX_POSITIONS = np.r_[0:8, 9:13, 14:18, 19:23, 24:36]
+
+
+def bulk_uuid4(n: int) -> np.ndarray:
+    """Generate n random (version 4) UUID strings from a single os.urandom draw"""
+    raw = np.frombuffer(os.urandom(16 * n), dtype=np.uint8).reshape(n, 16).copy()
+    raw[:, 6] = (raw[:, 6] & 0x0F) | 0x40  # version 4
+    raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80  # RFC 4122 variant
+    
+    hex_digits = np.frombuffer(raw.tobytes().hex().encode('ascii'), dtype='S1').reshape(n, 32)
+    dashed = np.full((n, 36), b'-', dtype='S1')
+    dashed[:, UUID_HEX_POSITIONS] = hex_digits
+    return dashed.view('S36').ravel().astype(str)
 
 
 class PayerClaimGenerator:
@@ -83,9 +163,17 @@ class PayerClaimGenerator:
         """
         self.fake = Faker()
         self.anomaly_rate = anomaly_rate
+        self.rng = np.random.default_rng(seed)
+        self._zip_pool = None
         Faker.seed(seed)
         random.seed(seed)
     
+    def zip_pool(self) -> np.ndarray:
+        """ZIP codes drawn from Faker once, for resampling in generate_batch"""
+        if self._zip_pool is None:
+            self._zip_pool = np.array([self.fake.zipcode() for _ in range(ZIP_POOL_SIZE)])
+        return self._zip_pool
+    
     def generate_npi(self) -> str:
         """Generate a valid-looking 10-digit NPI"""
         return str(random.randint(1000000000, 9999999999))
@@ -93,26 +181,8 @@ class PayerClaimGenerator:
     def generate_claim_amount(self, cpt_code: str) -> float:
         """Generate realistic claim amounts based on CPT code"""
         # Different procedure types have different cost ranges
-        if cpt_code.startswith("99"):  # Office/ER visits
-            return round(random.uniform(100, 500), 2)
-        elif cpt_code.startswith("45"):  # Procedures
-            return round(random.uniform(1000, 5000), 2)
-        elif cpt_code.startswith("93"):  # Cardiac tests
-            return round(random.uniform(200, 1500), 2)
-        elif cpt_code.startswith("80") or cpt_code.startswith("85"):  # Labs
-            return round(random.uniform(50, 300), 2)
-        elif cpt_code.startswith("70") or cpt_code.startswith("71"):  # Imaging
-            return round(random.uniform(500, 3000), 2)
-        elif cpt_code.startswith("77"):  # Mammography
-            return round(random.uniform(200, 800), 2)
-        elif cpt_code.startswith("36"):  # Blood draw
-            return round(random.uniform(25, 100), 2)
-        elif cpt_code.startswith("90"):  # Vaccines
-            return round(random.uniform(30, 150), 2)
-        elif cpt_code.startswith("J"):  # Drugs
-            return round(random.uniform(100, 5000), 2)
-        else:
-            return round(random.uniform(100, 1000), 2)
+        low, high = CPT_AMOUNT_RANGES.get(cpt_code) or _claim_amount_range(cpt_code)
+        return round(random.uniform(low, high), 2)
     
     def generate_service_date(self, days_back: int = 90) -> str:
         """Generate a random service date within the last N days"""
@@ -137,15 +207,7 @@ class PayerClaimGenerator:
         """
         rate = anomaly_rate if anomaly_rate is not None else self.anomaly_rate
         if random.random() < rate:
-            anomaly_type = random.choice([
-                "invalid_npi",
-                "negative_amount",
-                "future_date",
-                "invalid_cpt",
-                "missing_diagnosis",
-                "duplicate_claim",
-                "excessive_amount",
-            ])
+            anomaly_type = random.choice(ANOMALY_TYPES)
             
             if anomaly_type == "invalid_npi":
                 claim["provider_npi"] = "0000000000"
@@ -163,6 +225,39 @@ class PayerClaimGenerator:
         
         return claim
     
+    def introduce_anomalies_batch(self, claims: pd.DataFrame, anomaly_rate: float = None) -> pd.DataFrame:
+        """Vectorized introduce_anomalies over a whole batch
+        
+        Args:
+            claims: Claims DataFrame to modify in place
+            anomaly_rate: Override default anomaly rate (uses self.anomaly_rate if None)
+        """
+        rate = anomaly_rate if anomaly_rate is not None else self.anomaly_rate
+        rng = self.rng
+        
+        hit_rows = np.flatnonzero(rng.random(len(claims)) < rate)
+        anomaly_types = ANOMALY_TYPES_ARR[rng.integers(0, len(ANOMALY_TYPES), hit_rows.size)]
+        
+        def rows(anomaly_type):
+            return claims.index[hit_rows[anomaly_types == anomaly_type]]
+        
+        claims.loc[rows("invalid_npi"), "provider_npi"] = "0000000000"
+        
+        negative = rows("negative_amount")
+        claims.loc[negative, "claim_amount"] = -claims.loc[negative, "claim_amount"].abs()
+        
+        future = rows("future_date")
+        future_dates = np.datetime64(datetime.now().date()) + rng.integers(1, 31, future.size).astype('timedelta64[D]')
+        claims.loc[future, "service_date"] = np.datetime_as_string(future_dates, unit='D')
+        
+        claims.loc[rows("invalid_cpt"), "cpt_code"] = "INVALID"
+        claims.loc[rows("missing_diagnosis"), "icd10_code"] = ""
+        
+        excessive = rows("excessive_amount")
+        claims.loc[excessive, "claim_amount"] *= rng.uniform(10, 100, excessive.size)
+        
+        return claims
+    
     def generate_claim(self, member_id: str = None, include_anomalies: bool = True) -> Dict:
         """Generate a single payer claim"""
         if member_id is None:
@@ -170,10 +265,7 @@ class PayerClaimGenerator:
         
         provider_id = f"PRV{random.randint(10000, 99999)}"
         cpt_code = random.choice(CPT_CODES)
-        claim_status = random.choices(
-            CLAIM_STATUSES, 
-            weights=[0.75, 0.15, 0.10]  # 75% paid, 15% denied, 10% pending
-        )[0]
+        claim_status = random.choices(CLAIM_STATUSES, weights=CLAIM_STATUS_WEIGHTS)[0]
         
         service_date = self.generate_service_date()
         
@@ -189,7 +281,7 @@ class PayerClaimGenerator:
             "submission_date": self.generate_submission_date(service_date),
             "claim_status": claim_status,
             "denial_reason": random.choice(DENIAL_REASONS) if claim_status == "DENIED" else "",
-            "patient_dob": self.fake.date_of_birth(minimum_age=18, maximum_age=90).strftime("%Y-%m-%d"),
+            "patient_dob": self.fake.date_of_birth(minimum_age=PATIENT_MIN_AGE, maximum_age=PATIENT_MAX_AGE).strftime("%Y-%m-%d"),
             "patient_zip": self.fake.zipcode(),
             "patient_gender": random.choice(GENDERS),
         }
@@ -200,44 +292,83 @@ class PayerClaimGenerator:
         
         return claim
     
-    def generate_batch(self, num_claims: int, include_anomalies: bool = True) -> List[Dict]:
-        """Generate a batch of claims"""
-        claims = []
+    def generate_batch(self, num_claims: int, include_anomalies: bool = True) -> pd.DataFrame:
+        """Generate a batch of claims
+        
+        Each column is drawn as a NumPy array in one call rather than
+        building the batch claim by claim.
+        """
+        rng = self.rng
         
         # Generate claims for unique members (some members have multiple claims)
         num_members = int(num_claims * 0.6)  # 60% unique members
-        member_ids = [f"MBR{random.randint(100000, 999999)}" for _ in range(num_members)]
-        
-        for i in range(num_claims):
-            # Some members have multiple claims
-            if i < num_members:
-                member_id = member_ids[i]
-            else:
-                member_id = random.choice(member_ids)
-            
-            claim = self.generate_claim(member_id, include_anomalies)
-            claims.append(claim)
+        member_ids = np.char.add("MBR", rng.integers(100000, 1000000, num_members).astype(str))
+        member_ids = np.concatenate([
+            member_ids,
+            rng.choice(member_ids, num_claims - num_members)
+        ])
+        
+        cpt_idx = rng.integers(0, len(CPT_CODES), num_claims)
+        cpt_codes = CPT_CODES_ARR[cpt_idx]
+        claim_statuses = rng.choice(CLAIM_STATUSES_ARR, num_claims, p=CLAIM_STATUS_WEIGHTS)
+        
+        # Claim amounts: gather each row's [low, high) range by CPT index
+        claim_amounts = np.round(rng.uniform(CPT_AMOUNT_LOW[cpt_idx], CPT_AMOUNT_HIGH[cpt_idx]), 2)
+        
+        # Service dates within the last 90 days, submitted 1-30 days later
+        days_back = 90
+        start_date = np.datetime64(datetime.now().date()) - np.timedelta64(days_back, 'D')
+        service_dates = start_date + rng.integers(0, days_back + 1, num_claims).astype('timedelta64[D]')
+        submission_dates = service_dates + rng.integers(1, 31, num_claims).astype('timedelta64[D]')
+        
+        # Birth dates: a day offset back from today spanning ages 18-90, no Faker per row
+        today = np.datetime64(datetime.now().date())
+        min_age_days = int(PATIENT_MIN_AGE * 365.25)
+        max_age_days = int((PATIENT_MAX_AGE + 1) * 365.25)
+        patient_dobs = today - rng.integers(min_age_days, max_age_days, num_claims).astype('timedelta64[D]')
+        
+        claims = pd.DataFrame({
+            "claim_id": bulk_uuid4(num_claims),
+            "member_id": member_ids,
+            "provider_id": np.char.add("PRV", rng.integers(10000, 100000, num_claims).astype(str)),
+            "provider_npi": rng.integers(1000000000, 10000000000, num_claims).astype(str),
+            "cpt_code": cpt_codes,
+            "icd10_code": rng.choice(ICD10_CODES_ARR, num_claims),
+            "claim_amount": claim_amounts,
+            "service_date": np.datetime_as_string(service_dates, unit='D'),
+            "submission_date": np.datetime_as_string(submission_dates, unit='D'),
+            "claim_status": claim_statuses,
+            "denial_reason": np.where(
+                claim_statuses == "DENIED",
+                rng.choice(DENIAL_REASONS_ARR, num_claims),
+                ""
+            ),
+            "patient_dob": np.datetime_as_string(patient_dobs, unit='D'),
+            "patient_zip": rng.choice(self.zip_pool(), num_claims),
+            "patient_gender": rng.choice(GENDERS_ARR, num_claims),
+        }, columns=CLAIM_FIELDNAMES)
+        
+        # Introduce anomalies for testing
+        if include_anomalies:
+            claims = self.introduce_anomalies_batch(claims)
         
         return claims
     
-    def save_to_csv(self, claims: List[Dict], output_path: str):
-        """Save claims to CSV file"""
+    def save_to_csv(self, claims: Union[List[Dict], pd.DataFrame], output_path: str):
+        """Save claims (list of dicts or DataFrame) to CSV file"""
         output_file = Path(output_path)
         output_file.parent.mkdir(parents=True, exist_ok=True)
         
-        fieldnames = [
-            "claim_id", "member_id", "provider_id", "provider_npi",
-            "cpt_code", "icd10_code", "claim_amount", "service_date",
-            "submission_date", "claim_status", "denial_reason",
-            "patient_dob", "patient_zip", "patient_gender"
-        ]
+        if isinstance(claims, pd.DataFrame):
+            df = claims[CLAIM_FIELDNAMES]
+        else:
+            df = pd.DataFrame(claims, columns=CLAIM_FIELDNAMES)
         
-        with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(claims)
+        # One large buffer so the file goes out in a few big write() calls
+        with open(output_file, 'w', encoding='utf-8', newline='', buffering=CSV_WRITE_BUFFER_SIZE) as csvfile:
+            df.to_csv(csvfile, index=False, chunksize=CSV_WRITE_CHUNK_ROWS)
         
-        print(f"✓ Generated {len(claims)} claims and saved to {output_path}")
+        print(f"✓ Generated {len(df)} claims and saved to {output_path}")
     
     def generate_daily_batch(self, output_dir: str, num_claims: int = 1000, 
                            include_anomalies: bool = True):
@@ -246,6 +377,12 @@ class PayerClaimGenerator:
         filename = f"payer_claims_{timestamp}.csv"
         output_path = Path(output_dir) / filename
         
+        # Batches can now finish within the same second; don't overwrite
+        suffix = 1
+        while output_path.exists():
+            output_path = Path(output_dir) / f"payer_claims_{timestamp}_{suffix}.csv"
+            suffix += 1
+        
         claims = self.generate_batch(num_claims, include_anomalies)
         self.save_to_csv(claims, str(output_path))
         
@@ -3,7 +3,11 @@ Local Data Quality Validation Test
 Tests the DQ logic using Pandas (no Spark/Databricks required)
 """
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 import os
 from pathlib import Path
@@ -20,6 +24,64 @@ DQ_THRESHOLDS = {
 
 VALID_STATUSES = ["PAID", "DENIED", "PENDING"]
 VALID_GENDERS = ["M", "F", "U"]
+CLAIM_DATE_COLUMNS = ["service_date", "submission_date", "patient_dob"]
+
+# One bit per DQ rule, in the order issues are reported in dq_issues
+DQ_ISSUE_BITS = {
+    issue: 1 << bit for bit, issue in enumerate([
+        "MISSING_MEMBER_ID",
+        "MISSING_NPI",
+        "MISSING_CPT",
+        "MISSING_DIAGNOSIS",
+        "MISSING_AMOUNT",
+        "INVALID_NPI",
+        "NEGATIVE_AMOUNT",
+        "EXCESSIVE_AMOUNT",
+        "FUTURE_SERVICE_DATE",
+        "LATE_SUBMISSION",
+        "SUBMISSION_BEFORE_SERVICE",
+        "INVALID_STATUS",
+        "INVALID_GENDER",
+        "INVALID_ZIP",
+    ])
+}
+
+
+def dq_mask_to_issues(dq_mask: pd.Series) -> pd.Series:
+    """Expand a dq_mask bitmask column into the 'ISSUE_A;ISSUE_B;' string form"""
+    mask = dq_mask.to_numpy()
+    issues = pd.Series('', index=dq_mask.index, dtype=object)
+    for issue, bit in DQ_ISSUE_BITS.items():
+        issues += np.where(mask & bit, f'{issue};', '')
+    return issues
+
+
+def read_claims_csv(path: Path) -> pd.DataFrame:
+    """Read a claims CSV with Arrow's multithreaded reader"""
+    # Keep identifier columns as text so leading zeros survive (e.g. ZIP 01234),
+    # and treat empty fields as missing like pd.read_csv does
+    column_types = {
+        'provider_npi': pa.string(),
+        'patient_zip': pa.string(),
+        'claim_amount': pa.float64(),
+    }
+    read_options = pacsv.ReadOptions(use_threads=True)
+    
+    # Parse dates in Arrow's C++ reader; a malformed date fails the whole
+    # typed read, so fall back to text and let validate_data_quality coerce it
+    try:
+        convert_options = pacsv.ConvertOptions(
+            column_types={**column_types, **{column: pa.date32() for column in CLAIM_DATE_COLUMNS}},
+            strings_can_be_null=True,
+        )
+        table = pacsv.read_csv(path, read_options=read_options, convert_options=convert_options)
+    except pa.ArrowInvalid:
+        convert_options = pacsv.ConvertOptions(
+            column_types={**column_types, **{column: pa.string() for column in CLAIM_DATE_COLUMNS}},
+            strings_can_be_null=True,
+        )
+        table = pacsv.read_csv(path, read_options=read_options, convert_options=convert_options)
+    return table.to_pandas(date_as_object=False)
 
 
 def validate_data_quality(df: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
@@ -28,52 +90,72 @@ def validate_data_quality(df: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]
     Returns: (clean_df, anomalies_df)
     """
     
-    # Add DQ issues column
-    df['dq_issues'] = ''
+    # Each rule sets one bit; the dq_issues string is only built for anomalies
+    dq_mask = np.zeros(len(df), dtype=np.uint32)
+    
+    def flag(rows, issue):
+        dq_mask[np.asarray(rows, dtype=bool)] |= np.uint32(DQ_ISSUE_BITS[issue])
     
     # 1. Null/Missing value checks
-    df.loc[df['member_id'].isna(), 'dq_issues'] += 'MISSING_MEMBER_ID;'
-    df.loc[df['provider_npi'].isna(), 'dq_issues'] += 'MISSING_NPI;'
-    df.loc[df['cpt_code'].isna(), 'dq_issues'] += 'MISSING_CPT;'
-    df.loc[df['icd10_code'].isna() | (df['icd10_code'] == ''), 'dq_issues'] += 'MISSING_DIAGNOSIS;'
-    df.loc[df['claim_amount'].isna(), 'dq_issues'] += 'MISSING_AMOUNT;'
+    flag(df['member_id'].isna(), 'MISSING_MEMBER_ID')
+    flag(df['provider_npi'].isna(), 'MISSING_NPI')
+    flag(df['cpt_code'].isna(), 'MISSING_CPT')
+    flag(df['icd10_code'].isna() | (df['icd10_code'] == ''), 'MISSING_DIAGNOSIS')
+    flag(df['claim_amount'].isna(), 'MISSING_AMOUNT')
     
-    # 2. Invalid NPI format (must be 10 digits)
-    df['npi_valid'] = df['provider_npi'].astype(str).str.match(r'^\d{10}$')
-    df.loc[~df['npi_valid'], 'dq_issues'] += 'INVALID_NPI;'
+    # 2. Invalid NPI format (10 digits, no leading zero) - length + digit check,
+    # no regex. NPIs are read as text, so "0000000000" must be rejected here
+    npi = df['provider_npi'].astype('string')
+    df['npi_valid'] = (
+        (npi.str.len() == DQ_THRESHOLDS["npi_length"]) & npi.str.isdigit() & (npi.str[0] != '0')
+    ).fillna(False).astype(bool)
+    flag(~df['npi_valid'], 'INVALID_NPI')
     
     # 3. Claim amount validations
-    df.loc[df['claim_amount'] < DQ_THRESHOLDS["min_claim_amount"], 'dq_issues'] += 'NEGATIVE_AMOUNT;'
-    df.loc[df['claim_amount'] > DQ_THRESHOLDS["max_claim_amount"], 'dq_issues'] += 'EXCESSIVE_AMOUNT;'
+    flag(df['claim_amount'] < DQ_THRESHOLDS["min_claim_amount"], 'NEGATIVE_AMOUNT')
+    flag(df['claim_amount'] > DQ_THRESHOLDS["max_claim_amount"], 'EXCESSIVE_AMOUNT')
     
-    # 4. Date validations
-    current_date = datetime.now().date()
-    df['service_date'] = pd.to_datetime(df['service_date'], errors='coerce')
-    df['submission_date'] = pd.to_datetime(df['submission_date'], errors='coerce')
+    # 4. Date validations - explicit format keeps parsing on the C fastpath,
+    # cache=True reuses parses for the many claims sharing a date
+    today = np.datetime64(datetime.now().date())
+    for column in ('service_date', 'submission_date'):
+        # Already datetime64 when read_claims_csv typed the column
+        if not pd.api.types.is_datetime64_any_dtype(df[column]):
+            df[column] = pd.to_datetime(df[column], format='%Y-%m-%d', errors='coerce', cache=True)
+    service = df['service_date'].to_numpy()
+    submission = df['submission_date'].to_numpy()
     
-    # Convert to date for comparison
-    df['service_date_only'] = df['service_date'].dt.date
-    df['submission_date_only'] = df['submission_date'].dt.date
+    flag(service > today, 'FUTURE_SERVICE_DATE')
     
-    df.loc[df['service_date_only'] > current_date, 'dq_issues'] += 'FUTURE_SERVICE_DATE;'
-    
-    # Calculate days difference (using timedelta objects)
-    df['days_to_submission'] = (df['submission_date'] - df['service_date']).dt.days
-    df.loc[df['days_to_submission'] > DQ_THRESHOLDS["max_days_to_submission"], 'dq_issues'] += 'LATE_SUBMISSION;'
-    df.loc[df['submission_date'] < df['service_date'], 'dq_issues'] += 'SUBMISSION_BEFORE_SERVICE;'
+    # NaT compares False, so unparseable dates raise none of these flags
+    days_to_submission = (submission - service).astype('timedelta64[D]')
+    flag(days_to_submission > np.timedelta64(DQ_THRESHOLDS["max_days_to_submission"], 'D'), 'LATE_SUBMISSION')
+    flag(submission < service, 'SUBMISSION_BEFORE_SERVICE')
     
     # 5. Invalid status
-    df.loc[~df['claim_status'].isin(VALID_STATUSES), 'dq_issues'] += 'INVALID_STATUS;'
+    flag(~df['claim_status'].isin(VALID_STATUSES), 'INVALID_STATUS')
     
     # 6. Gender validation
-    df.loc[~df['patient_gender'].isin(VALID_GENDERS), 'dq_issues'] += 'INVALID_GENDER;'
+    flag(~df['patient_gender'].isin(VALID_GENDERS), 'INVALID_GENDER')
+    
+    # 7. ZIP code validation (5 or 9 digits, i.e. 12345 or 12345-6789)
+    zip_code = df['patient_zip'].astype('string')
+    zip_len = zip_code.str.len()
+    zip_valid = (
+        ((zip_len == 5) & zip_code.str.isdigit()) |
+        ((zip_len == 10) & zip_code.str.slice(0, 5).str.isdigit() &
+         (zip_code.str.slice(5, 6) == '-') & zip_code.str.slice(6).str.isdigit())
+    ).fillna(False).astype(bool)
+    flag(~zip_valid, 'INVALID_ZIP')
     
     # Mark records as clean or anomalous
-    df['is_anomaly'] = df['dq_issues'].str.len() > 0
+    df['dq_mask'] = dq_mask
+    df['is_anomaly'] = dq_mask != 0
     
     # Split into clean and anomalies
-    clean_df = df[~df['is_anomaly']].drop(columns=['dq_issues', 'is_anomaly', 'npi_valid', 'days_to_submission', 'service_date_only', 'submission_date_only'])
+    clean_df = df[~df['is_anomaly']].drop(columns=['dq_mask', 'is_anomaly', 'npi_valid'])
     anomalies_df = df[df['is_anomaly']].copy()
+    anomalies_df['dq_issues'] = dq_mask_to_issues(anomalies_df['dq_mask'])
     
     return clean_df, anomalies_df
 
@@ -81,25 +163,53 @@ def validate_data_quality(df: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]
 def detect_statistical_anomalies(df: pd.DataFrame) -> pd.DataFrame:
     """
     Detect statistical anomalies using z-score method
+    Per-CPT statistics are computed with np.bincount over factorized codes
+    instead of a groupby + merge
     """
     
-    # Calculate statistics per CPT code
-    stats_df = df.groupby('cpt_code')['claim_amount'].agg(['mean', 'std', 'count']).reset_index()
-    stats_df.columns = ['cpt_code', 'avg_amount', 'stddev_amount', 'count']
+    # Fewer than two rows: no CPT group has a sample stddev, so nothing can
+    # be an outlier - skip the factorize/bincount pass
+    if len(df) < 2:
+        df_with_stats = df.reset_index(drop=True)
+        has_code = df_with_stats['cpt_code'].notna().to_numpy()
+        df_with_stats['avg_amount'] = np.where(has_code, df_with_stats['claim_amount'], np.nan)
+        df_with_stats['stddev_amount'] = np.nan
+        df_with_stats['count'] = np.where(has_code, 1, np.nan)
+        df_with_stats['z_score'] = 0.0
+        df_with_stats['is_statistical_outlier'] = False
+        return df_with_stats
+    
+    codes, uniques = pd.factorize(df['cpt_code'])
+    amounts = df['claim_amount'].to_numpy(dtype=np.float64)
+    has_code = codes >= 0
+    group_codes = codes[has_code]
+    group_amounts = amounts[has_code]
+    
+    # Calculate statistics per CPT code (sample stddev, matching pandas .std())
+    counts = np.bincount(group_codes, minlength=len(uniques))
+    means = np.bincount(group_codes, weights=group_amounts, minlength=len(uniques)) / counts
+    sq_dev = np.bincount(group_codes, weights=(group_amounts - means[group_codes]) ** 2, minlength=len(uniques))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        stddevs = np.sqrt(sq_dev / (counts - 1))
     
-    # Merge stats back
-    df_with_stats = df.merge(stats_df, on='cpt_code', how='left')
+    # Broadcast stats back to rows (rows without a CPT code get NaN stats)
+    df_with_stats = df.reset_index(drop=True)
+    row_codes = np.where(has_code, codes, 0)
+    df_with_stats['avg_amount'] = np.where(has_code, means[row_codes], np.nan)
+    df_with_stats['stddev_amount'] = np.where(has_code, stddevs[row_codes], np.nan)
+    df_with_stats['count'] = np.where(has_code, counts[row_codes], np.nan)
     
     # Calculate z-score
-    df_with_stats['z_score'] = 0.0
-    mask = df_with_stats['stddev_amount'] > 0
-    df_with_stats.loc[mask, 'z_score'] = (
-        (df_with_stats.loc[mask, 'claim_amount'] - df_with_stats.loc[mask, 'avg_amount']) / 
-        df_with_stats.loc[mask, 'stddev_amount']
+    mask = df_with_stats['stddev_amount'].to_numpy() > 0
+    z_score = np.zeros(len(df_with_stats))
+    z_score[mask] = (
+        (amounts[mask] - df_with_stats['avg_amount'].to_numpy()[mask]) /
+        df_with_stats['stddev_amount'].to_numpy()[mask]
     )
+    df_with_stats['z_score'] = z_score
     
     # Flag outliers (z-score > 3 or < -3)
-    df_with_stats['is_statistical_outlier'] = df_with_stats['z_score'].abs() > 3
+    df_with_stats['is_statistical_outlier'] = np.abs(z_score) > 3
     
     return df_with_stats
 
@@ -116,6 +226,56 @@ def calculate_dq_metrics(raw_count: int, clean_count: int, anomaly_count: int) -
     }
 
 
+def process_file(csv_file: Path) -> tuple[pd.DataFrame, pd.DataFrame, list[str]]:
+    """
+    Validate a single CSV file
+    Returns: (clean_df, anomaly_df, report lines to print)
+    """
+    report = [f"Processing: {csv_file.name}", "-" * 70]
+    
+    # Read CSV
+    df = read_claims_csv(csv_file)
+    raw_count = len(df)
+    report.append(f"  Loaded: {raw_count:,} claims")
+    
+    # Data Quality Validation
+    clean_df, anomaly_df = validate_data_quality(df)
+    clean_count = len(clean_df)
+    anomaly_count = len(anomaly_df)
+    
+    report.append(f"  ✓ Clean claims: {clean_count:,}")
+    report.append(f"  ⚠ Anomalous claims: {anomaly_count:,}")
+    
+    # Statistical Outlier Detection
+    if clean_count > 0:
+        clean_with_outliers = detect_statistical_anomalies(clean_df)
+        outlier_count = clean_with_outliers['is_statistical_outlier'].sum()
+        report.append(f"  📊 Statistical outliers: {outlier_count:,}")
+    else:
+        outlier_count = 0
+    
+    # Calculate DQ metrics
+    metrics = calculate_dq_metrics(raw_count, clean_count, anomaly_count)
+    report.append(f"  📈 Data Quality Score: {metrics['data_quality_score']:.2f}%")
+    report.append(f"  📉 Anomaly Rate: {metrics['anomaly_rate']:.2f}%")
+    
+    # Show top DQ issues
+    if anomaly_count > 0:
+        report.append("\n  Top Data Quality Issues:")
+        # One vectorized popcount per rule bit instead of splitting strings
+        dq_mask = anomaly_df['dq_mask'].to_numpy()
+        issue_counts = pd.Series({
+            issue: np.count_nonzero(dq_mask & bit)
+            for issue, bit in DQ_ISSUE_BITS.items()
+        })
+        issue_counts = issue_counts[issue_counts > 0].sort_values(ascending=False, kind='stable')
+        
+        for issue, count in issue_counts.head(5).items():
+            report.append(f"    - {issue}: {count:,} occurrences")
+    
+    return clean_df, anomaly_df, report
+
+
 def main():
     """Main test function"""
     print("=" * 70)
@@ -144,52 +304,16 @@ def main():
     all_anomalies = []
     all_outliers = []
     
-    for csv_file in csv_files:
-        print(f"Processing: {csv_file.name}")
-        print("-" * 70)
-        
-        # Read CSV
-        df = pd.read_csv(csv_file)
-        raw_count = len(df)
-        print(f"  Loaded: {raw_count:,} claims")
-        
-        # Data Quality Validation
-        clean_df, anomaly_df = validate_data_quality(df)
-        clean_count = len(clean_df)
-        anomaly_count = len(anomaly_df)
-        
-        print(f"  ✓ Clean claims: {clean_count:,}")
-        print(f"  ⚠ Anomalous claims: {anomaly_count:,}")
-        
-        # Statistical Outlier Detection
-        if clean_count > 0:
-            clean_with_outliers = detect_statistical_anomalies(clean_df)
-            outlier_count = clean_with_outliers['is_statistical_outlier'].sum()
-            print(f"  📊 Statistical outliers: {outlier_count:,}")
-        else:
-            outlier_count = 0
-        
-        # Calculate DQ metrics
-        metrics = calculate_dq_metrics(raw_count, clean_count, anomaly_count)
-        print(f"  📈 Data Quality Score: {metrics['data_quality_score']:.2f}%")
-        print(f"  📉 Anomaly Rate: {metrics['anomaly_rate']:.2f}%")
-        
-        # Show top DQ issues
-        if anomaly_count > 0:
-            print("\n  Top Data Quality Issues:")
-            issue_counts = {}
-            for issues in anomaly_df['dq_issues']:
-                for issue in issues.split(';'):
-                    if issue:
-                        issue_counts[issue] = issue_counts.get(issue, 0) + 1
+    # Files are independent, so validate them in parallel worker processes;
+    # map() keeps results (and their printed reports) in file order
+    max_workers = min(len(csv_files), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for clean_df, anomaly_df, report in executor.map(process_file, csv_files):
+            print("\n".join(report))
+            print()
             
-            for issue, count in sorted(issue_counts.items(), key=lambda x: x[1], reverse=True)[:5]:
-                print(f"    - {issue}: {count:,} occurrences")
-        
-        print()
-        
-        all_clean.append(clean_df)
-        all_anomalies.append(anomaly_df)
+            all_clean.append(clean_df)
+            all_anomalies.append(anomaly_df)
     
     # Overall summary
     print("=" * 70)
@@ -0,0 +1,22 @@
+"""
+NPI rule check for the local DQ validation
+Run with: pytest data/test_npi_validation.py
+"""
+
+from generate_payer_data import PayerClaimGenerator
+from test_dq_validation import read_claims_csv, validate_data_quality
+
+
+def test_generator_invalid_npi_is_flagged(tmp_path):
+    """The generator's invalid_npi anomaly ("0000000000") fails INVALID_NPI after a CSV round-trip"""
+    generator = PayerClaimGenerator(seed=7, anomaly_rate=1.0)
+    claims = generator.generate_batch(500)
+    bad_npi = claims['provider_npi'] == "0000000000"
+    assert bad_npi.any()
+    
+    csv_path = tmp_path / "claims.csv"
+    generator.save_to_csv(claims, str(csv_path))
+    _, anomalies_df = validate_data_quality(read_claims_csv(csv_path))
+    
+    flagged = set(anomalies_df.loc[anomalies_df['dq_issues'].str.contains('INVALID_NPI;'), 'claim_id'])
+    assert flagged == set(claims.loc[bad_npi, 'claim_id'])
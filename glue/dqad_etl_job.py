@@ -24,14 +24,20 @@ from pyspark.sql import SparkSession
 from pyspark.sql.functions import (
     col, when, count, sum as _sum, avg, stddev, max as _max, min as _min,
     current_timestamp, lit, abs as _abs, datediff, to_date, year, month, dayofmonth,
-    regexp_extract, length, isnan, isnull, coalesce, concat
+    regexp_extract, length, isnan, isnull, coalesce, concat, broadcast,
+    format_string, input_file_name, regexp_replace, expr
 )
+from pyspark.storagelevel import StorageLevel
 from pyspark.sql.types import (
     StructType, StructField, StringType, DoubleType, DateType, IntegerType
 )
 import json
+import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import reduce
 import boto3
+from botocore.config import Config
 
 # Get job parameters
 args = getResolvedOptions(sys.argv, [
@@ -49,6 +55,20 @@ spark = glueContext.spark_session
 job = Job(glueContext)
 job.init(args['JOB_NAME'], args)
 
+# Glue's log4j logger: messages land in the driver log with timestamps
+logger = glueContext.get_logger()
+
+# zstd gives noticeably smaller gold/silver/quarantine files than the
+# default snappy at similar write cost (dictionary encoding is on by default)
+spark.conf.set("spark.sql.parquet.compression.codec", "zstd")
+
+# Adaptive execution sizes shuffles to the actual claim volume: small
+# files collapse the default 200 shuffle partitions into a few tasks
+spark.conf.set("spark.sql.adaptive.enabled", "true")
+spark.conf.set("spark.sql.adaptive.coalescePartitions.enabled", "true")
+spark.conf.set("spark.sql.adaptive.advisoryPartitionSizeInBytes", "128m")
+spark.conf.set("spark.sql.adaptive.skewJoin.enabled", "true")
+
 # Configuration from parameters
 S3_RAW_BUCKET = args['S3_RAW_BUCKET']
 S3_PROCESSED_BUCKET = args['S3_PROCESSED_BUCKET']
@@ -56,9 +76,24 @@ S3_INPUT_KEY = args['S3_INPUT_KEY']
 CLOUDWATCH_NAMESPACE = args['CLOUDWATCH_NAMESPACE']
 
 RAW_CLAIMS_PATH = f"s3://{S3_RAW_BUCKET}/{S3_INPUT_KEY}"
+# Folder prefix for aggregated metrics (e.g., "claims/" from "claims/file.csv")
+SOURCE_FOLDER_PREFIX = S3_INPUT_KEY.partition('/')[0] + '/' if '/' in S3_INPUT_KEY else S3_INPUT_KEY
 GOLD_OUTPUT_PATH = f"s3://{S3_PROCESSED_BUCKET}/gold/"
 SILVER_OUTPUT_PATH = f"s3://{S3_PROCESSED_BUCKET}/silver/"
 QUARANTINE_OUTPUT_PATH = f"s3://{S3_PROCESSED_BUCKET}/quarantine/"
+LATEST_SOURCE_FILE_KEY = "_latest.txt"  # Read by the dashboard to find the latest run
+MAX_METRIC_DATA_PER_CALL = 1000  # CloudWatch PutMetricData per-request limit
+GOLD_MAX_RECORDS_PER_FILE = 1000000  # Caps gold parquet file size without an extra shuffle
+SMALL_LAYER_RECORDS_PER_FILE = 50000  # Silver/quarantine rows per coalesced output file
+
+# AWS clients are built once for the job run rather than inside each helper
+CLIENT_CONFIG = Config(
+    region_name='us-east-1',
+    retries={'max_attempts': 5, 'mode': 'adaptive'},
+    max_pool_connections=16
+)
+cloudwatch = boto3.client('cloudwatch', config=CLIENT_CONFIG)
+s3_client = boto3.client('s3', config=CLIENT_CONFIG)
 
 # Data quality thresholds
 DQ_THRESHOLDS = {
@@ -70,11 +105,31 @@ DQ_THRESHOLDS = {
     "max_days_to_submission": 365,
 }
 
-print(f"Starting DQAD ETL Job")
-print(f"Processing file: {RAW_CLAIMS_PATH}")
-print(f"Gold output: {GOLD_OUTPUT_PATH}")
-print(f"Silver output: {SILVER_OUTPUT_PATH}")
-print(f"Quarantine output: {QUARANTINE_OUTPUT_PATH}")
+# One bit per DQ rule, in the order issues are reported in dq_issues
+DQ_ISSUE_BITS = {
+    issue: 1 << bit for bit, issue in enumerate([
+        "MISSING_MEMBER_ID",
+        "MISSING_NPI",
+        "MISSING_CPT",
+        "MISSING_DIAGNOSIS",
+        "MISSING_AMOUNT",
+        "INVALID_NPI",
+        "NEGATIVE_AMOUNT",
+        "EXCESSIVE_AMOUNT",
+        "FUTURE_SERVICE_DATE",
+        "LATE_SUBMISSION",
+        "SUBMISSION_BEFORE_SERVICE",
+        "INVALID_STATUS",
+        "INVALID_GENDER",
+        "INVALID_ZIP",
+    ])
+}
+
+logger.info("Starting DQAD ETL Job")
+logger.info(f"Processing file: {RAW_CLAIMS_PATH}")
+logger.info(f"Gold output: {GOLD_OUTPUT_PATH}")
+logger.info(f"Silver output: {SILVER_OUTPUT_PATH}")
+logger.info(f"Quarantine output: {QUARANTINE_OUTPUT_PATH}")
 
 # ============================================================================
 # SCHEMA DEFINITION
@@ -111,14 +166,26 @@ def read_raw_claims(path: str):
         .load(path)
     
     # Add ingestion metadata
-    df = df.withColumn("ingestion_timestamp", current_timestamp()) \
-           .withColumn("source_file", lit(S3_INPUT_KEY))
+    df = df.withColumn("ingestion_timestamp", current_timestamp())
     
-    return df
+    if not S3_INPUT_KEY.endswith('/'):
+        # Single-file run: the key is exactly the SourceFile dimension
+        # the metrics and dashboard use
+        return df.withColumn("source_file", lit(S3_INPUT_KEY))
+    
+    # Folder-level run (e.g. "claims/"): tag each row with the key of the
+    # file it came from. input_file_name() is a URI whose path may be
+    # percent-encoded, so strip the bucket and decode it back to the raw key
+    # ('+' is protected first because URLDecoder would turn it into a space)
+    return df.withColumn(
+        "source_file",
+        regexp_replace(input_file_name(), f"^s3a?://{re.escape(S3_RAW_BUCKET)}/", "")
+    ).withColumn(
+        "source_file",
+        expr("reflect('java.net.URLDecoder', 'decode', regexp_replace(source_file, '[+]', '%2B'), 'UTF-8')")
+    )
 
 raw_claims_df = read_raw_claims(RAW_CLAIMS_PATH)
-raw_count = raw_claims_df.count()
-print(f"Loaded {raw_count} raw claims from {S3_INPUT_KEY}")
 
 # ============================================================================
 # DATA QUALITY VALIDATION
@@ -127,110 +194,96 @@ print(f"Loaded {raw_count} raw claims from {S3_INPUT_KEY}")
 def validate_data_quality(df):
     """
     Perform comprehensive data quality checks and flag anomalies
-    Returns: (clean_df, dq_failures_df)
+    Returns: claims labeled with a dq_mask bitmask and has_dq_issues
     """
     
-    # Add DQ flag columns
-    dq_df = df.withColumn("dq_issues", lit(""))
-    
-    # 1. Null/Missing value checks
-    dq_df = dq_df.withColumn(
-        "dq_issues",
-        when(col("member_id").isNull(), concat(col("dq_issues"), lit("MISSING_MEMBER_ID;")))
-        .when(col("provider_npi").isNull(), concat(col("dq_issues"), lit("MISSING_NPI;")))
-        .when(col("cpt_code").isNull(), concat(col("dq_issues"), lit("MISSING_CPT;")))
-        .when(col("icd10_code").isNull() | (col("icd10_code") == ""), concat(col("dq_issues"), lit("MISSING_DIAGNOSIS;")))
-        .when(col("claim_amount").isNull(), concat(col("dq_issues"), lit("MISSING_AMOUNT;")))
-        .otherwise(col("dq_issues"))
-    )
-    
-    # 2. Invalid NPI format (must be 10 digits)
-    dq_df = dq_df.withColumn(
-        "npi_valid",
-        (length(col("provider_npi")) == DQ_THRESHOLDS["npi_length"]) & 
-        col("provider_npi").rlike("^[0-9]{10}$")
-    )
-    dq_df = dq_df.withColumn(
-        "dq_issues",
-        when(~col("npi_valid"), concat(col("dq_issues"), lit("INVALID_NPI;")))
-        .otherwise(col("dq_issues"))
-    )
-    
-    # 3. Claim amount validations
-    dq_df = dq_df.withColumn(
-        "dq_issues",
-        when(col("claim_amount") < DQ_THRESHOLDS["min_claim_amount"], 
-             concat(col("dq_issues"), lit("NEGATIVE_AMOUNT;")))
-        .when(col("claim_amount") > DQ_THRESHOLDS["max_claim_amount"], 
-              concat(col("dq_issues"), lit("EXCESSIVE_AMOUNT;")))
-        .otherwise(col("dq_issues"))
-    )
-    
-    # 4. Date validations
     current_date = datetime.now().date()
-    dq_df = dq_df.withColumn(
-        "dq_issues",
-        when(col("service_date") > lit(current_date), 
-             concat(col("dq_issues"), lit("FUTURE_SERVICE_DATE;")))
-        .when(datediff(col("submission_date"), col("service_date")) > DQ_THRESHOLDS["max_days_to_submission"],
-              concat(col("dq_issues"), lit("LATE_SUBMISSION;")))
-        .when(col("submission_date") < col("service_date"),
-              concat(col("dq_issues"), lit("SUBMISSION_BEFORE_SERVICE;")))
-        .otherwise(col("dq_issues"))
-    )
-    
-    # 5. Invalid status
     valid_statuses = ["PAID", "DENIED", "PENDING"]
-    dq_df = dq_df.withColumn(
-        "dq_issues",
-        when(~col("claim_status").isin(valid_statuses),
-             concat(col("dq_issues"), lit("INVALID_STATUS;")))
-        .otherwise(col("dq_issues"))
-    )
-    
-    # 6. Gender validation
     valid_genders = ["M", "F", "U"]
-    dq_df = dq_df.withColumn(
-        "dq_issues",
-        when(~col("patient_gender").isin(valid_genders),
-             concat(col("dq_issues"), lit("INVALID_GENDER;")))
-        .otherwise(col("dq_issues"))
-    )
     
-    # 7. ZIP code validation (5 or 9 digits)
-    dq_df = dq_df.withColumn(
-        "dq_issues",
-        when(~col("patient_zip").rlike("^[0-9]{5}(-[0-9]{4})?$"),
-             concat(col("dq_issues"), lit("INVALID_ZIP;")))
-        .otherwise(col("dq_issues"))
+    # Every rule is evaluated independently (a null condition counts as passing)
+    rules = {
+        # 1. Null/Missing value checks
+        "MISSING_MEMBER_ID": col("member_id").isNull(),
+        "MISSING_NPI": col("provider_npi").isNull(),
+        "MISSING_CPT": col("cpt_code").isNull(),
+        "MISSING_DIAGNOSIS": col("icd10_code").isNull() | (col("icd10_code") == ""),
+        "MISSING_AMOUNT": col("claim_amount").isNull(),
+        # 2. Invalid NPI format (10 digits, no leading zero)
+        "INVALID_NPI": ~((length(col("provider_npi")) == DQ_THRESHOLDS["npi_length"]) &
+                         col("provider_npi").rlike("^[1-9][0-9]{9}$")),
+        # 3. Claim amount validations
+        "NEGATIVE_AMOUNT": col("claim_amount") < DQ_THRESHOLDS["min_claim_amount"],
+        "EXCESSIVE_AMOUNT": col("claim_amount") > DQ_THRESHOLDS["max_claim_amount"],
+        # 4. Date validations
+        "FUTURE_SERVICE_DATE": col("service_date") > lit(current_date),
+        "LATE_SUBMISSION": datediff(col("submission_date"), col("service_date")) > DQ_THRESHOLDS["max_days_to_submission"],
+        "SUBMISSION_BEFORE_SERVICE": col("submission_date") < col("service_date"),
+        # 5. Invalid status
+        "INVALID_STATUS": ~col("claim_status").isin(valid_statuses),
+        # 6. Gender validation
+        "INVALID_GENDER": ~col("patient_gender").isin(valid_genders),
+        # 7. ZIP code validation (5 or 9 digits)
+        "INVALID_ZIP": ~col("patient_zip").rlike("^[0-9]{5}(-[0-9]{4})?$"),
+    }
+    
+    # Single projection: OR the rule bits into one integer column
+    dq_mask = reduce(
+        lambda acc, rule: acc.bitwiseOR(rule),
+        [when(condition, lit(DQ_ISSUE_BITS[issue])).otherwise(lit(0)) for issue, condition in rules.items()]
     )
     
     # Mark records as clean or failed DQ
-    dq_df = dq_df.withColumn("has_dq_issues", length(col("dq_issues")) > 0)
-    
-    # Split into clean and DQ failures
-    clean_df = dq_df.filter(~col("has_dq_issues")).drop("dq_issues", "has_dq_issues", "npi_valid")
-    dq_failures_df = dq_df.filter(col("has_dq_issues"))
+    dq_df = df.withColumn("dq_mask", dq_mask) \
+              .withColumn("has_dq_issues", col("dq_mask") != 0)
     
-    return clean_df, dq_failures_df
-
-# Run validation
-clean_claims, dq_failures = validate_data_quality(raw_claims_df)
-clean_count = clean_claims.count()
-dq_failure_count = dq_failures.count()
-
-print(f"Clean claims (passed DQ): {clean_count}")
-print(f"DQ failures: {dq_failure_count}")
+    return dq_df
+
+def dq_issues_from_mask(mask_col):
+    """Expand a dq_mask bitmask column into the 'ISSUE_A;ISSUE_B;' string form"""
+    return concat(*[
+        when(mask_col.bitwiseAND(bit) != 0, lit(f"{issue};")).otherwise(lit(""))
+        for issue, bit in DQ_ISSUE_BITS.items()
+    ])
+
+# Run validation once and keep the labeled claims for every downstream split
+dq_claims = validate_data_quality(raw_claims_df).persist(StorageLevel.MEMORY_AND_DISK)
+
+# Split into clean and DQ failures
+clean_claims = dq_claims.filter(~col("has_dq_issues")).drop("dq_mask", "has_dq_issues")
+dq_failures = dq_claims.filter(col("has_dq_issues"))
+
+# Single pass for raw / clean / failure counts instead of one job per count()
+dq_counts = dq_claims.agg(
+    count("*").alias("raw_count"),
+    _sum(col("has_dq_issues").cast("int")).alias("dq_failure_count")
+).first()
+raw_count = dq_counts["raw_count"]
+dq_failure_count = dq_counts["dq_failure_count"] or 0
+clean_count = raw_count - dq_failure_count
+
+logger.info(f"Loaded {raw_count} raw claims from {S3_INPUT_KEY}")
+logger.info(f"Clean claims (passed DQ): {clean_count}")
+logger.info(f"DQ failures: {dq_failure_count}")
 
 # ============================================================================
 # ANOMALY DETECTION - STATISTICAL ANALYSIS
 # ============================================================================
 
-def detect_statistical_anomalies(df):
+def detect_statistical_anomalies(df, row_count):
     """
     Detect statistical anomalies using z-score method
     """
     
+    # Fewer than two rows: no CPT group has a stddev, so skip the
+    # aggregation and join entirely and flag nothing
+    if row_count < 2:
+        return df.withColumn("avg_amount", col("claim_amount")) \
+                 .withColumn("stddev_amount", lit(None).cast(DoubleType())) \
+                 .withColumn("count", lit(row_count).cast("long")) \
+                 .withColumn("z_score", lit(0.0)) \
+                 .withColumn("is_statistical_outlier", lit(False))
+    
     # Calculate statistics per CPT code
     stats_df = df.groupBy("cpt_code").agg(
         avg("claim_amount").alias("avg_amount"),
@@ -238,8 +291,9 @@ def detect_statistical_anomalies(df):
         count("*").alias("count")
     )
     
-    # Join stats back to main dataframe
-    df_with_stats = df.join(stats_df, "cpt_code", "left")
+    # Join stats back to main dataframe - one row per CPT code, so broadcast
+    # it rather than shuffling every claim for a sort-merge join
+    df_with_stats = df.join(broadcast(stats_df), "cpt_code", "left")
     
     # Calculate z-score
     df_with_stats = df_with_stats.withColumn(
@@ -258,23 +312,25 @@ def detect_statistical_anomalies(df):
     return df_with_stats
 
 # Detect statistical anomalies on clean data
-claims_with_outliers = detect_statistical_anomalies(clean_claims)
+claims_with_outliers = detect_statistical_anomalies(clean_claims, clean_count).persist(StorageLevel.MEMORY_AND_DISK)
 statistical_outliers = claims_with_outliers.filter(col("is_statistical_outlier"))
-outlier_count = statistical_outliers.count()
+outlier_count = statistical_outliers.count() if clean_count >= 2 else 0
+
+gold_count = clean_count - outlier_count
 
-print(f"Statistical outliers detected: {outlier_count}")
+logger.info(f"Statistical outliers detected: {outlier_count}")
 
 # ============================================================================
 # PREPARE OUTPUTS
 # ============================================================================
 
-# Gold layer: Clean claims without statistical outliers
-gold_claims = claims_with_outliers.filter(~col("is_statistical_outlier")) \
-    .drop("avg_amount", "stddev_amount", "count", "z_score", "is_statistical_outlier")
-
-# Add partition columns for gold layer
-gold_claims = gold_claims.withColumn("year", year(col("service_date"))) \
-                         .withColumn("month", month(col("service_date")))
+# Gold layer: Clean claims without statistical outliers, plus partition
+# columns, in a single projection (clean_claims.columns is schema-only)
+gold_claims = claims_with_outliers.filter(~col("is_statistical_outlier")).select(
+    *clean_claims.columns,
+    year(col("service_date")).alias("year"),
+    month(col("service_date")).alias("month")
+)
 
 # Silver layer: DQ failures (for manual review)
 silver_claims = dq_failures.select(
@@ -284,7 +340,7 @@ silver_claims = dq_failures.select(
     col("cpt_code"),
     col("claim_amount"),
     col("service_date"),
-    col("dq_issues"),
+    dq_issues_from_mask(col("dq_mask")).alias("dq_issues"),
     col("ingestion_timestamp"),
     col("source_file")
 )
@@ -301,13 +357,9 @@ quarantine_claims = statistical_outliers.select(
     col("avg_amount"),
     col("stddev_amount"),
     lit("STATISTICAL_OUTLIER").alias("anomaly_type"),
-    concat(
-        lit("Z-score: "), 
-        col("z_score").cast("string"),
-        lit(" | Avg: "),
-        col("avg_amount").cast("string"),
-        lit(" | StdDev: "),
-        col("stddev_amount").cast("string")
+    format_string(
+        "Z-score: %s | Avg: %s | StdDev: %s",
+        col("z_score"), col("avg_amount"), col("stddev_amount")
     ).alias("anomaly_details"),
     col("ingestion_timestamp"),
     col("source_file")
@@ -317,28 +369,43 @@ quarantine_claims = statistical_outliers.select(
 # WRITE TO S3
 # ============================================================================
 
-print("Writing outputs to S3...")
+logger.info("Writing outputs to S3...")
 
-# Write gold layer (clean data)
-gold_claims.write \
-    .mode("append") \
-    .partitionBy("year", "month") \
-    .parquet(GOLD_OUTPUT_PATH)
-print(f"✓ Written {gold_claims.count()} clean records to {GOLD_OUTPUT_PATH}")
+# The layers are independent, so submit the writes as concurrent Spark jobs
+# to overlap their S3 uploads and commits
+output_writes = []
 
-# Write silver layer (DQ failures) if any exist
+# Gold layer (clean data) if any exist - one task per (year, month) directory
+# so each run adds a single file per partition instead of one per shuffle partition
+if gold_count > 0:
+    output_writes.append((gold_claims.repartition("year", "month").write.mode("append")
+                          .option("maxRecordsPerFile", GOLD_MAX_RECORDS_PER_FILE)
+                          .partitionBy("year", "month"), GOLD_OUTPUT_PATH,
+                          f"{gold_count} clean records"))
+
+# Silver layer (DQ failures) if any exist
 if dq_failure_count > 0:
-    silver_claims.write \
-        .mode("append") \
-        .parquet(SILVER_OUTPUT_PATH)
-    print(f"✓ Written {dq_failure_count} DQ failures to {SILVER_OUTPUT_PATH}")
+    output_writes.append((silver_claims.coalesce(max(1, dq_failure_count // SMALL_LAYER_RECORDS_PER_FILE))
+                          .write.mode("append"), SILVER_OUTPUT_PATH,
+                          f"{dq_failure_count} DQ failures"))
 
-# Write quarantine layer (statistical outliers) if any exist
+# Quarantine layer (statistical outliers) if any exist
 if outlier_count > 0:
-    quarantine_claims.write \
-        .mode("append") \
-        .parquet(QUARANTINE_OUTPUT_PATH)
-    print(f"✓ Written {outlier_count} statistical outliers to {QUARANTINE_OUTPUT_PATH}")
+    output_writes.append((quarantine_claims.coalesce(max(1, outlier_count // SMALL_LAYER_RECORDS_PER_FILE))
+                          .write.mode("append"), QUARANTINE_OUTPUT_PATH,
+                          f"{outlier_count} statistical outliers"))
+
+if output_writes:
+    with ThreadPoolExecutor(max_workers=len(output_writes)) as executor:
+        futures = [executor.submit(writer.parquet, path) for writer, path, _ in output_writes]
+        for future, (_, path, description) in zip(futures, output_writes):
+            future.result()
+            logger.info(f"✓ Written {description} to {path}")
+else:
+    logger.info("No records to write")
+
+claims_with_outliers.unpersist()
+dq_claims.unpersist()
 
 # ============================================================================
 # CALCULATE DATA QUALITY METRICS
@@ -365,185 +432,104 @@ def calculate_dq_metrics(raw_count, clean_count, dq_failure_count, outlier_count
 
 dq_metrics = calculate_dq_metrics(raw_count, clean_count, dq_failure_count, outlier_count)
 
-print("\n" + "=" * 70)
-print("DQAD ETL Pipeline - Execution Summary")
-print("=" * 70)
-print(f"Total records ingested: {dq_metrics['total_records']}")
-print(f"Gold (clean) records: {dq_metrics['gold_records']}")
-print(f"Silver (DQ failures): {dq_metrics['silver_records']}")
-print(f"Quarantine (outliers): {dq_metrics['quarantine_records']}")
-print(f"Data Quality Score: {dq_metrics['data_quality_score']:.2f}%")
-print(f"Anomaly Rate: {dq_metrics['anomaly_rate']:.2f}%")
-print("=" * 70)
+logger.info("\n".join([
+    "=" * 70,
+    "DQAD ETL Pipeline - Execution Summary",
+    "=" * 70,
+    f"Total records ingested: {dq_metrics['total_records']}",
+    f"Gold (clean) records: {dq_metrics['gold_records']}",
+    f"Silver (DQ failures): {dq_metrics['silver_records']}",
+    f"Quarantine (outliers): {dq_metrics['quarantine_records']}",
+    f"Data Quality Score: {dq_metrics['data_quality_score']:.2f}%",
+    f"Anomaly Rate: {dq_metrics['anomaly_rate']:.2f}%",
+    "=" * 70,
+]))
 
 # ============================================================================
 # PUSH METRICS TO CLOUDWATCH
 # ============================================================================
 
+def put_metric_data_batched(cloudwatch, metric_data):
+    """Send metric datums in as few PutMetricData requests as the API allows"""
+    for start in range(0, len(metric_data), MAX_METRIC_DATA_PER_CALL):
+        cloudwatch.put_metric_data(
+            Namespace=CLOUDWATCH_NAMESPACE,
+            MetricData=metric_data[start:start + MAX_METRIC_DATA_PER_CALL]
+        )
+
 def push_metrics_to_cloudwatch(metrics):
     """Push custom metrics to CloudWatch"""
     try:
-        cloudwatch = boto3.client('cloudwatch', region_name='us-east-1')
-        
-        # Extract folder prefix from source_file (e.g., "claims/" from "claims/file.csv")
         source_file = metrics['source_file']
-        folder_prefix = source_file.split('/')[0] + '/' if '/' in source_file else source_file
+        folder_prefix = SOURCE_FOLDER_PREFIX
         
-        # Create metric data for individual file
-        metric_data = [
-            {
-                'MetricName': 'TotalRecords',
-                'Value': metrics['total_records'],
-                'Unit': 'Count',
-                'Timestamp': datetime.now(),
-                'Dimensions': [
-                    {'Name': 'SourceFile', 'Value': source_file}
-                ]
-            },
-            {
-                'MetricName': 'GoldRecords',
-                'Value': metrics['gold_records'],
-                'Unit': 'Count',
-                'Timestamp': datetime.now(),
-                'Dimensions': [
-                    {'Name': 'SourceFile', 'Value': source_file}
-                ]
-            },
-            {
-                'MetricName': 'SilverRecords',
-                'Value': metrics['silver_records'],
-                'Unit': 'Count',
-                'Timestamp': datetime.now(),
-                'Dimensions': [
-                    {'Name': 'SourceFile', 'Value': source_file}
-                ]
-            },
-            {
-                'MetricName': 'QuarantineRecords',
-                'Value': metrics['quarantine_records'],
-                'Unit': 'Count',
-                'Timestamp': datetime.now(),
-                'Dimensions': [
-                    {'Name': 'SourceFile', 'Value': source_file}
-                ]
-            },
-            {
-                'MetricName': 'AnomalyCount',
-                'Value': metrics['total_anomalies'],
-                'Unit': 'Count',
-                'Timestamp': datetime.now(),
-                'Dimensions': [
-                    {'Name': 'SourceFile', 'Value': source_file}
-                ]
-            },
-            {
-                'MetricName': 'DataQualityScore',
-                'Value': metrics['data_quality_score'],
-                'Unit': 'Percent',
-                'Timestamp': datetime.now(),
-                'Dimensions': [
-                    {'Name': 'SourceFile', 'Value': source_file}
-                ]
-            },
-            {
-                'MetricName': 'AnomalyRate',
-                'Value': metrics['anomaly_rate'],
-                'Unit': 'Percent',
-                'Timestamp': datetime.now(),
-                'Dimensions': [
-                    {'Name': 'SourceFile', 'Value': source_file}
-                ]
-            }
+        # (metric name, value, unit) published once per dimension set below
+        metric_values = [
+            ('TotalRecords', metrics['total_records'], 'Count'),
+            ('GoldRecords', metrics['gold_records'], 'Count'),
+            ('SilverRecords', metrics['silver_records'], 'Count'),
+            ('QuarantineRecords', metrics['quarantine_records'], 'Count'),
+            ('AnomalyCount', metrics['total_anomalies'], 'Count'),
+            ('DataQualityScore', metrics['data_quality_score'], 'Percent'),
+            ('AnomalyRate', metrics['anomaly_rate'], 'Percent'),
         ]
         
-        # Also publish aggregated metrics with folder prefix for easy querying
-        aggregated_metric_data = [
-            {
-                'MetricName': 'TotalRecords',
-                'Value': metrics['total_records'],
-                'Unit': 'Count',
-                'Timestamp': datetime.now(),
-                'Dimensions': [
-                    {'Name': 'SourceFile', 'Value': folder_prefix}
-                ]
-            },
-            {
-                'MetricName': 'GoldRecords',
-                'Value': metrics['gold_records'],
-                'Unit': 'Count',
-                'Timestamp': datetime.now(),
-                'Dimensions': [
-                    {'Name': 'SourceFile', 'Value': folder_prefix}
-                ]
-            },
-            {
-                'MetricName': 'SilverRecords',
-                'Value': metrics['silver_records'],
-                'Unit': 'Count',
-                'Timestamp': datetime.now(),
-                'Dimensions': [
-                    {'Name': 'SourceFile', 'Value': folder_prefix}
-                ]
-            },
-            {
-                'MetricName': 'QuarantineRecords',
-                'Value': metrics['quarantine_records'],
-                'Unit': 'Count',
-                'Timestamp': datetime.now(),
-                'Dimensions': [
-                    {'Name': 'SourceFile', 'Value': folder_prefix}
-                ]
-            },
-            {
-                'MetricName': 'AnomalyCount',
-                'Value': metrics['total_anomalies'],
-                'Unit': 'Count',
-                'Timestamp': datetime.now(),
-                'Dimensions': [
-                    {'Name': 'SourceFile', 'Value': folder_prefix}
-                ]
-            },
-            {
-                'MetricName': 'DataQualityScore',
-                'Value': metrics['data_quality_score'],
-                'Unit': 'Percent',
-                'Timestamp': datetime.now(),
-                'Dimensions': [
-                    {'Name': 'SourceFile', 'Value': folder_prefix}
-                ]
-            },
+        # Individual file, plus aggregated folder prefix for easy querying
+        dimension_sets = [
+            [{'Name': 'SourceFile', 'Value': source_file}],
+            [{'Name': 'SourceFile', 'Value': folder_prefix}],
+        ]
+        
+        timestamp = datetime.now()
+        metric_data = [
             {
-                'MetricName': 'AnomalyRate',
-                'Value': metrics['anomaly_rate'],
-                'Unit': 'Percent',
-                'Timestamp': datetime.now(),
-                'Dimensions': [
-                    {'Name': 'SourceFile', 'Value': folder_prefix}
-                ]
+                'MetricName': name,
+                'Value': value,
+                'Unit': unit,
+                'Timestamp': timestamp,
+                'Dimensions': dimensions
             }
+            for dimensions in dimension_sets
+            for name, value, unit in metric_values
         ]
         
         # Push both individual and aggregated metrics
-        cloudwatch.put_metric_data(
-            Namespace=CLOUDWATCH_NAMESPACE,
-            MetricData=metric_data + aggregated_metric_data
-        )
+        put_metric_data_batched(cloudwatch, metric_data)
         
-        print(f"✓ Metrics pushed to CloudWatch (file: {source_file}, aggregated: {folder_prefix})")
+        logger.info(f"✓ Metrics pushed to CloudWatch (file: {source_file}, aggregated: {folder_prefix})")
         
         # Log metrics as JSON for structured logging
-        print(f"METRICS_JSON: {json.dumps(metrics)}")
+        logger.info(f"METRICS_JSON: {json.dumps(metrics)}")
         
     except Exception as e:
-        print(f"Error pushing metrics to CloudWatch: {str(e)}")
+        logger.error(f"Error pushing metrics to CloudWatch: {str(e)}")
         raise
 
 # Push metrics
 push_metrics_to_cloudwatch(dq_metrics)
 
+def record_latest_source_file(source_file):
+    """Record the processed file key so the dashboard can look it up directly"""
+    # Folder-level reprocessing runs (e.g. "claims/") are not a single file
+    if source_file.endswith('/'):
+        return
+    
+    try:
+        s3_client.put_object(
+            Bucket=S3_PROCESSED_BUCKET,
+            Key=LATEST_SOURCE_FILE_KEY,
+            Body=source_file.encode('utf-8'),
+            ContentType='text/plain'
+        )
+        logger.info(f"✓ Latest source file recorded at s3://{S3_PROCESSED_BUCKET}/{LATEST_SOURCE_FILE_KEY}")
+    except Exception as e:
+        logger.warn(f"Warning: Failed to record latest source file: {str(e)}")
+
+record_latest_source_file(S3_INPUT_KEY)
+
 # ============================================================================
 # JOB COMPLETION
 # ============================================================================
 
 job.commit()
-print("✓ DQAD ETL Job completed successfully")
+logger.info("✓ DQAD ETL Job completed successfully")
@@ -135,6 +135,26 @@ resource "aws_iam_policy" "sns_policy" {
   })
 }
 
+# Policy for the cost collector's last-alert parameter
+resource "aws_iam_policy" "ssm_cost_alert_policy" {
+  name        = "${var.project_name}-ssm-cost-alert-policy"
+  description = "Allow Lambda to read and update the last cost alert parameter"
+  
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Effect = "Allow"
+        Action = [
+          "ssm:GetParameter",
+          "ssm:PutParameter"
+        ]
+        Resource = "arn:aws:ssm:*:*:parameter/${var.project_name}/${var.environment}/last_cost_alert"
+      }
+    ]
+  })
+}
+
 # Policy for Glue Job Access
 resource "aws_iam_policy" "glue_job_policy" {
   name        = "${var.project_name}-glue-job-policy"
@@ -188,6 +208,11 @@ resource "aws_iam_role_policy_attachment" "sns_attachment" {
   policy_arn = aws_iam_policy.sns_policy.arn
 }
 
+resource "aws_iam_role_policy_attachment" "ssm_cost_alert_attachment" {
+  role       = aws_iam_role.lambda_execution_role.name
+  policy_arn = aws_iam_policy.ssm_cost_alert_policy.arn
+}
+
 resource "aws_iam_role_policy_attachment" "glue_job_attachment" {
   role       = aws_iam_role.lambda_execution_role.name
   policy_arn = aws_iam_policy.glue_job_policy.arn
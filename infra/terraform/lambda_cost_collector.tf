@@ -16,6 +16,7 @@ resource "aws_lambda_function" "cost_collector" {
       ENVIRONMENT         = var.environment
       COST_THRESHOLD_USD  = var.cost_threshold_usd
       SNS_TOPIC_ARN       = aws_sns_topic.dqad_alerts.arn
+      COST_ALERT_PARAMETER = "/${var.project_name}/${var.environment}/last_cost_alert"
     }
   }
   
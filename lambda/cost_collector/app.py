@@ -3,17 +3,23 @@ AWS Cost Explorer Lambda - Collects cost metrics and pushes to CloudWatch
 """
 
 import json
+import logging
 import os
 from datetime import datetime, timedelta
-from typing import Dict, List
+from typing import Dict, List, Optional
 import boto3
 from botocore.exceptions import ClientError
 
+# Module-level logger; the Lambda runtime forwards it to CloudWatch Logs
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
 # Initialize AWS clients
 ce_client = boto3.client('ce')  # Cost Explorer
 cw_client = boto3.client('cloudwatch')
 events_client = boto3.client('events')
 sns_client = boto3.client('sns')
+ssm_client = boto3.client('ssm')
 
 # Configuration from environment variables
 CLOUDWATCH_NAMESPACE = os.getenv('CLOUDWATCH_NAMESPACE', 'DQAD/Cost')
@@ -21,6 +27,9 @@ PROJECT_NAME = os.getenv('PROJECT_NAME', 'dqad')
 ENVIRONMENT = os.getenv('ENVIRONMENT', 'dev')
 COST_THRESHOLD_USD = float(os.getenv('COST_THRESHOLD_USD', '50.0'))
 SNS_TOPIC_ARN = os.getenv('SNS_TOPIC_ARN', '')
+COST_ALERT_PARAMETER = os.getenv('COST_ALERT_PARAMETER', f'/{PROJECT_NAME}/{ENVIRONMENT}/last_cost_alert')
+COST_ALERT_CHANGE_RATIO = 0.10  # re-alert while over threshold only if cost moved by more than this
+MAX_METRIC_DATA_PER_CALL = 1000  # CloudWatch PutMetricData per-request limit
 
 
 def get_cost_and_usage(start_date: str, end_date: str) -> Dict:
@@ -50,7 +59,7 @@ def get_cost_and_usage(start_date: str, end_date: str) -> Dict:
         )
         return response
     except ClientError as e:
-        print(f"Error fetching cost data: {e}")
+        logger.error(f"Error fetching cost data: {e}")
         # Fallback: get overall account costs
         response = ce_client.get_cost_and_usage(
             TimePeriod={
@@ -84,7 +93,7 @@ def get_cost_forecast(start_date: str, end_date: str) -> Dict:
         )
         return response
     except ClientError as e:
-        print(f"Error fetching forecast: {e}")
+        logger.error(f"Error fetching forecast: {e}")
         return None
 
 
@@ -100,19 +109,19 @@ def parse_cost_data(cost_response: Dict) -> Dict:
         }
     
     results = cost_response['ResultsByTime'][0]
-    total_cost = 0.0
-    service_costs = {}
-    
-    # Calculate total cost
-    if 'Total' in results:
-        total_cost = float(results['Total'].get('UnblendedCost', {}).get('Amount', 0.0))
     
     # Parse service-level costs
-    if 'Groups' in results:
-        for group in results['Groups']:
-            service = group['Keys'][0]
-            amount = float(group['Metrics']['UnblendedCost']['Amount'])
-            service_costs[service] = amount
+    service_costs = {
+        group['Keys'][0]: float(group['Metrics']['UnblendedCost']['Amount'])
+        for group in results.get('Groups', ())
+    }
+    
+    # Calculate total cost (Cost Explorer leaves Total empty for grouped
+    # queries, so fall back to the sum of the service costs)
+    if results.get('Total'):
+        total_cost = float(results['Total'].get('UnblendedCost', {}).get('Amount', 0.0))
+    else:
+        total_cost = sum(service_costs.values())
     
     return {
         'total_cost': total_cost,
@@ -121,11 +130,11 @@ def parse_cost_data(cost_response: Dict) -> Dict:
     }
 
 
-def push_cost_metrics_to_cloudwatch(cost_data: Dict):
+def push_cost_metrics_to_cloudwatch(cost_data: Dict, timestamp: datetime = None):
     """
     Push cost metrics to CloudWatch
     """
-    timestamp = datetime.now()
+    timestamp = timestamp or datetime.now()
     
     metric_data = [
         {
@@ -141,8 +150,8 @@ def push_cost_metrics_to_cloudwatch(cost_data: Dict):
     ]
     
     # Add service-specific metrics
-    for service, cost in cost_data['service_costs'].items():
-        metric_data.append({
+    metric_data.extend(
+        {
             'MetricName': 'ServiceCost',
             'Value': cost,
             'Unit': 'None',
@@ -151,78 +160,138 @@ def push_cost_metrics_to_cloudwatch(cost_data: Dict):
                 {'Name': 'Project', 'Value': PROJECT_NAME},
                 {'Name': 'Service', 'Value': service}
             ]
-        })
+        }
+        for service, cost in cost_data['service_costs'].items()
+    )
     
     try:
-        cw_client.put_metric_data(
-            Namespace=CLOUDWATCH_NAMESPACE,
-            MetricData=metric_data
+        # Stay within the PutMetricData per-request datum limit
+        for start in range(0, len(metric_data), MAX_METRIC_DATA_PER_CALL):
+            cw_client.put_metric_data(
+                Namespace=CLOUDWATCH_NAMESPACE,
+                MetricData=metric_data[start:start + MAX_METRIC_DATA_PER_CALL]
+            )
+        logger.info(f"✓ Pushed {len(metric_data)} metrics to CloudWatch")
+    except ClientError as e:
+        logger.error(f"Error pushing metrics: {e}")
+
+
+def get_last_alert_cost() -> Optional[float]:
+    """
+    Get the cost recorded by the previous invocation, or None if there is none
+    """
+    try:
+        response = ssm_client.get_parameter(Name=COST_ALERT_PARAMETER)
+        return float(response['Parameter']['Value'])
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'ParameterNotFound':
+            logger.warning(f"Could not read last alert cost: {e}")
+        return None
+    except ValueError:
+        return None
+
+
+def save_last_alert_cost(total_cost: float):
+    """
+    Record the cost the last alert decision was based on
+    """
+    try:
+        ssm_client.put_parameter(
+            Name=COST_ALERT_PARAMETER,
+            Value=str(total_cost),
+            Type='String',
+            Overwrite=True
         )
-        print(f"✓ Pushed {len(metric_data)} metrics to CloudWatch")
     except ClientError as e:
-        print(f"Error pushing metrics: {e}")
+        logger.warning(f"Could not save last alert cost: {e}")
 
 
-def check_cost_threshold(cost_data: Dict) -> bool:
+def should_alert(total_cost: float, last_cost: Optional[float]) -> bool:
     """
-    Check if cost exceeds threshold and trigger alert
+    Alert on a threshold crossing, or when an over-threshold cost moved noticeably
     """
-    if cost_data['total_cost'] > COST_THRESHOLD_USD:
-        print(f"⚠ Cost threshold exceeded: ${cost_data['total_cost']:.2f} > ${COST_THRESHOLD_USD:.2f}")
-        
-        # Trigger EventBridge event
-        try:
-            event_detail = {
-                'current_cost': cost_data['total_cost'],
-                'threshold': COST_THRESHOLD_USD,
-                'service_breakdown': cost_data['service_costs'],
-                'date': cost_data['date'],
-                'timestamp': datetime.now().isoformat()
-            }
-            
-            events_client.put_events(
-                Entries=[
-                    {
-                        'Source': 'custom.dqad',
-                        'DetailType': 'Cost Spike Detected',
-                        'Detail': json.dumps(event_detail)
-                    }
-                ]
-            )
-            print("✓ Cost spike event triggered")
-            
-            # Send SNS notification
-            if SNS_TOPIC_ARN:
-                sns_client.publish(
-                    TopicArn=SNS_TOPIC_ARN,
-                    Subject=f'DQAD Alert: Cost Threshold Exceeded',
-                    Message=json.dumps(event_detail, indent=2)
-                )
-                print("✓ SNS notification sent")
-            
-        except ClientError as e:
-            print(f"Error triggering events: {e}")
-        
+    if total_cost <= COST_THRESHOLD_USD:
+        return False
+    if last_cost is None or last_cost <= COST_THRESHOLD_USD:
         return True
-    
-    return False
+    return abs(total_cost - last_cost) > COST_ALERT_CHANGE_RATIO * last_cost
+
+
+def check_cost_threshold(cost_data: Dict, timestamp: datetime = None) -> bool:
+    """
+    Check if cost exceeds threshold and trigger alert.
+    Repeat alerts for an unchanged over-threshold cost are suppressed.
+    """
+    total_cost = cost_data['total_cost']
+    last_cost = get_last_alert_cost()
+
+    if total_cost <= COST_THRESHOLD_USD:
+        # Reset the baseline once cost is back under the threshold so the
+        # next crossing alerts again
+        if last_cost is None or last_cost > COST_THRESHOLD_USD:
+            save_last_alert_cost(total_cost)
+        return False
+
+    logger.warning(f"⚠ Cost threshold exceeded: ${total_cost:.2f} > ${COST_THRESHOLD_USD:.2f}")
+    if not should_alert(total_cost, last_cost):
+        logger.info(f"Cost unchanged since last alert (${last_cost:.2f}), skipping notification")
+        return True
+
+    # Trigger EventBridge event
+    try:
+        event_detail = {
+            'current_cost': total_cost,
+            'threshold': COST_THRESHOLD_USD,
+            'service_breakdown': cost_data['service_costs'],
+            'date': cost_data['date'],
+            'timestamp': (timestamp or datetime.now()).isoformat()
+        }
+
+        events_client.put_events(
+            Entries=[
+                {
+                    'Source': 'custom.dqad',
+                    'DetailType': 'Cost Spike Detected',
+                    'Detail': json.dumps(event_detail)
+                }
+            ]
+        )
+        logger.info("✓ Cost spike event triggered")
+
+        # Send SNS notification
+        if SNS_TOPIC_ARN:
+            sns_client.publish(
+                TopicArn=SNS_TOPIC_ARN,
+                Subject=f'DQAD Alert: Cost Threshold Exceeded',
+                Message=json.dumps(event_detail, indent=2)
+            )
+            logger.info("✓ SNS notification sent")
+
+        # Only a delivered alert moves the baseline; a failed one is retried next run
+        save_last_alert_cost(total_cost)
+
+    except ClientError as e:
+        logger.error(f"Error triggering events: {e}")
+
+    return True
 
 
 def lambda_handler(event, context):
     """
     Main Lambda handler - collects costs and pushes to CloudWatch
     """
-    print(f"Cost Collector Lambda triggered at {datetime.now()}")
-    print(f"Event: {json.dumps(event, default=str)}")
+    # One timestamp per invocation, shared by the date window, metrics and events
+    now = datetime.now()
+    today = now.date()
+    yesterday = today - timedelta(days=1)
+    logger.info(f"Cost Collector Lambda triggered at {now}")
+    logger.info(f"Event: {json.dumps(event, default=str)}")
     
     # Handle different invocation types
     action = event.get('action', 'collect_costs')
     
     if action == 'check_cost_status':
         # Quick cost check for Step Functions
-        today = datetime.now().date()
-        yesterday = today - timedelta(days=1)
-        
         cost_response = get_cost_and_usage(
             start_date=yesterday.strftime('%Y-%m-%d'),
             end_date=today.strftime('%Y-%m-%d')
@@ -242,12 +311,8 @@ def lambda_handler(event, context):
     
     # Default: Collect and report costs
     try:
-        # Get yesterday's costs
-        today = datetime.now().date()
-        yesterday = today - timedelta(days=1)
-        
-        # Get cost and usage
-        print(f"Fetching costs from {yesterday} to {today}")
+        # Get yesterday's cost and usage
+        logger.info(f"Fetching costs from {yesterday} to {today}")
         cost_response = get_cost_and_usage(
             start_date=yesterday.strftime('%Y-%m-%d'),
             end_date=today.strftime('%Y-%m-%d')
@@ -255,7 +320,7 @@ def lambda_handler(event, context):
         
         # Parse cost data
         cost_data = parse_cost_data(cost_response)
-        print(f"Total daily cost: ${cost_data['total_cost']:.2f}")
+        logger.info(f"Total daily cost: ${cost_data['total_cost']:.2f}")
         
         # Get forecast (optional)
         try:
@@ -265,15 +330,15 @@ def lambda_handler(event, context):
             
             if forecast_response and 'Total' in forecast_response:
                 forecast_amount = float(forecast_response['Total']['Amount'])
-                print(f"30-day forecast: ${forecast_amount:.2f}")
+                logger.info(f"30-day forecast: ${forecast_amount:.2f}")
         except Exception as e:
-            print(f"Forecast unavailable: {e}")
+            logger.warning(f"Forecast unavailable: {e}")
         
         # Push metrics to CloudWatch
-        push_cost_metrics_to_cloudwatch(cost_data)
+        push_cost_metrics_to_cloudwatch(cost_data, now)
         
         # Check threshold
-        threshold_exceeded = check_cost_threshold(cost_data)
+        threshold_exceeded = check_cost_threshold(cost_data, now)
         
         return {
             'statusCode': 200,
@@ -286,7 +351,7 @@ def lambda_handler(event, context):
         }
         
     except Exception as e:
-        print(f"Error in lambda_handler: {str(e)}")
+        logger.error(f"Error in lambda_handler: {str(e)}")
         return {
             'statusCode': 500,
             'body': json.dumps({
@@ -7,13 +7,27 @@ S3 ObjectCreated:* → Lambda → StartGlueJob → CloudWatch Metrics
 """
 
 import json
+import logging
 import boto3
 import os
+from botocore.config import Config
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
-# Initialize AWS clients
-glue_client = boto3.client('glue')
-cloudwatch = boto3.client('cloudwatch')
+# Module-level logger; the Lambda runtime forwards it to CloudWatch Logs
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# Initialize AWS clients (module scope, reused across warm invocations)
+MAX_CONCURRENT_TRIGGERS = 10  # Parallel StartJobRun calls per invocation
+MAX_METRIC_DATA_PER_CALL = 1000  # CloudWatch PutMetricData per-request limit
+
+CLIENT_CONFIG = Config(
+    retries={'max_attempts': 5, 'mode': 'adaptive'},
+    max_pool_connections=MAX_CONCURRENT_TRIGGERS
+)
+glue_client = boto3.client('glue', config=CLIENT_CONFIG)
+cloudwatch = boto3.client('cloudwatch', config=CLIENT_CONFIG)
 
 # Environment variables
 GLUE_JOB_NAME = os.environ['GLUE_JOB_NAME']
@@ -27,24 +41,53 @@ def lambda_handler(event, context):
     Handle S3 ObjectCreated events and trigger Glue ETL job
     """
     
-    print(f"Received event: {json.dumps(event)}")
+    # One timestamp per invocation for logs and metrics
+    invoked_at = datetime.now()
+    invoked_at_iso = invoked_at.isoformat()
+    logger.info(f"Received event: {json.dumps(event)}")
     
     try:
         # Parse S3 event
-        for record in event['Records']:
-            if record['eventName'].startswith('ObjectCreated'):
-                bucket = record['s3']['bucket']['name']
-                key = record['s3']['object']['key']
-                size = record['s3']['object']['size']
-                
-                print(f"Processing S3 event: bucket={bucket}, key={key}, size={size} bytes")
-                
-                # Start Glue job
-                response = start_glue_job(bucket, key)
+        created = [
+            (record['s3']['bucket']['name'], record['s3']['object']['key'], record['s3']['object']['size'])
+            for record in event['Records']
+            if record['eventName'].startswith('ObjectCreated')
+        ]
+        for bucket, key, size in created:
+            logger.info(f"Processing S3 event: bucket={bucket}, key={key}, size={size} bytes")
+        
+        # Start one Glue job run per file concurrently; StartJobRun is
+        # latency-bound, so multi-object events no longer wait on each call.
+        # Each future is resolved on its own so one failed start can't hide
+        # the runs that did start
+        job_run_ids = []
+        failed_keys = []
+        started_buckets = []
+        if created:
+            with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_TRIGGERS, len(created))) as executor:
+                futures = [
+                    (bucket, key, size, executor.submit(start_glue_job, bucket, key))
+                    for bucket, key, size in created
+                ]
+            
+            for bucket, key, size, future in futures:
+                try:
+                    response = future.result()
+                except Exception as e:
+                    error_log = {
+                        "timestamp": invoked_at_iso,
+                        "event_type": "glue_trigger_error",
+                        "source_bucket": bucket,
+                        "source_key": key,
+                        "error": str(e)
+                    }
+                    logger.error(f"ERROR: {json.dumps(error_log)}")
+                    failed_keys.append(key)
+                    continue
                 
                 # Log success
                 log_event = {
-                    "timestamp": datetime.now().isoformat(),
+                    "timestamp": invoked_at_iso,
                     "event_type": "glue_job_triggered",
                     "source_bucket": bucket,
                     "source_key": key,
@@ -52,16 +95,37 @@ def lambda_handler(event, context):
                     "glue_job_name": GLUE_JOB_NAME,
                     "glue_job_run_id": response['JobRunId']
                 }
-                print(f"SUCCESS: {json.dumps(log_event)}")
-                
-                # Push CloudWatch metric
-                push_trigger_metric(bucket, key, response['JobRunId'])
-                
+                logger.info(f"SUCCESS: {json.dumps(log_event)}")
+                job_run_ids.append(response['JobRunId'])
+                started_buckets.append(bucket)
+            
+            # Push CloudWatch metrics for all triggered files in one call
+            if started_buckets:
+                push_trigger_metrics(started_buckets, invoked_at)
+        
+        if failed_keys:
+            if not job_run_ids:
+                # Nothing started, so a retry of the whole event is safe
+                raise RuntimeError(f"Failed to start Glue job for: {', '.join(failed_keys)}")
+            
+            # Some runs already started; raising would make the retry start
+            # them again, so report only the keys that failed
+            return {
+                'statusCode': 500,
+                'body': json.dumps({
+                    'message': 'Glue job failed to start for some files',
+                    'failed_keys': failed_keys,
+                    'job_run_id': job_run_ids[-1],
+                    'job_run_ids': job_run_ids
+                })
+            }
+        
         return {
             'statusCode': 200,
             'body': json.dumps({
                 'message': 'Glue job triggered successfully',
-                'job_run_id': response['JobRunId']
+                'job_run_id': job_run_ids[-1] if job_run_ids else None,
+                'job_run_ids': job_run_ids
             })
         }
         
@@ -72,7 +136,7 @@ def lambda_handler(event, context):
             "error": str(e),
             "event": event
         }
-        print(f"ERROR: {json.dumps(error_log)}")
+        logger.error(f"ERROR: {json.dumps(error_log)}")
         raise
 
 
@@ -81,7 +145,7 @@ def start_glue_job(bucket, key):
     Start AWS Glue ETL job with S3 file parameters
     """
     
-    print(f"Starting Glue job: {GLUE_JOB_NAME}")
+    logger.info(f"Starting Glue job: {GLUE_JOB_NAME}")
     
     # Job arguments
     job_args = {
@@ -97,33 +161,36 @@ def start_glue_job(bucket, key):
         Arguments=job_args
     )
     
-    print(f"Glue job started successfully. JobRunId: {response['JobRunId']}")
+    logger.info(f"Glue job started successfully. JobRunId: {response['JobRunId']}")
     
     return response
 
 
-def push_trigger_metric(bucket, key, job_run_id):
+def push_trigger_metrics(buckets, timestamp):
     """
-    Push CloudWatch metric for Glue job trigger
+    Push CloudWatch metrics for Glue job triggers (one datum per file)
     """
     
     try:
-        cloudwatch.put_metric_data(
-            Namespace=CLOUDWATCH_NAMESPACE,
-            MetricData=[
-                {
-                    'MetricName': 'GlueJobTriggered',
-                    'Value': 1,
-                    'Unit': 'Count',
-                    'Timestamp': datetime.now(),
-                    'Dimensions': [
-                        {'Name': 'SourceBucket', 'Value': bucket},
-                        {'Name': 'JobName', 'Value': GLUE_JOB_NAME}
-                    ]
-                }
-            ]
-        )
-        print("CloudWatch metric pushed: GlueJobTriggered")
+        metric_data = [
+            {
+                'MetricName': 'GlueJobTriggered',
+                'Value': 1,
+                'Unit': 'Count',
+                'Timestamp': timestamp,
+                'Dimensions': [
+                    {'Name': 'SourceBucket', 'Value': bucket},
+                    {'Name': 'JobName', 'Value': GLUE_JOB_NAME}
+                ]
+            }
+            for bucket in buckets
+        ]
+        for start in range(0, len(metric_data), MAX_METRIC_DATA_PER_CALL):
+            cloudwatch.put_metric_data(
+                Namespace=CLOUDWATCH_NAMESPACE,
+                MetricData=metric_data[start:start + MAX_METRIC_DATA_PER_CALL]
+            )
+        logger.info(f"CloudWatch metric pushed: GlueJobTriggered x{len(metric_data)}")
         
     except Exception as e:
-        print(f"Warning: Failed to push CloudWatch metric: {str(e)}")
+        logger.warning(f"Warning: Failed to push CloudWatch metric: {str(e)}")
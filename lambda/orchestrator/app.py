@@ -4,12 +4,15 @@ Actions: restart Glue job, quarantine data, send alerts
 Supports both CloudWatch alarm triggers and manual API Gateway triggers
 """
 
+import gzip
 import json
 import os
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from typing import Dict, Optional
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
 # Configure structured JSON logging
@@ -20,14 +23,16 @@ class JSONFormatter(logging.Formatter):
     """Custom JSON formatter for structured logging"""
     def format(self, record):
         log_obj = {
-            'timestamp': datetime.utcnow().isoformat(),
+            # record.created is the time the record was made; no extra clock call
+            'timestamp': datetime.utcfromtimestamp(record.created).isoformat(),
             'level': record.levelname,
             'message': record.getMessage(),
             'function': record.funcName,
             'line': record.lineno
         }
-        if hasattr(record, 'event_data'):
-            log_obj['event_data'] = record.event_data
+        event_data = getattr(record, 'event_data', None)
+        if event_data is not None:
+            log_obj['event_data'] = event_data
         return json.dumps(log_obj)
 
 # Set JSON formatter
@@ -35,10 +40,26 @@ handler = logging.StreamHandler()
 handler.setFormatter(JSONFormatter())
 logger.handlers = [handler]
 
-# Initialize AWS clients
-s3_client = boto3.client('s3')
-sns_client = boto3.client('sns')
-glue_client = boto3.client('glue')
+# AWS clients are created on first use and reused across warm invocations,
+# so an action only pays for loading the service models it actually needs.
+# The connection pool matches the quarantine worker count so copy threads
+# don't block waiting for a connection
+MAX_QUARANTINE_WORKERS = 32  # Parallel copy/tag requests during quarantine
+
+CLIENT_CONFIG = Config(
+    retries={'max_attempts': 10, 'mode': 'adaptive'},
+    max_pool_connections=MAX_QUARANTINE_WORKERS
+)
+_clients = {}
+
+
+def get_client(service: str):
+    """Return the shared boto3 client for a service, creating it on first use"""
+    client = _clients.get(service)
+    if client is None:
+        client = _clients[service] = boto3.client(service, config=CLIENT_CONFIG)
+    return client
+
 
 # Configuration
 PROJECT_NAME = os.getenv('PROJECT_NAME', 'dqad')
@@ -50,6 +71,32 @@ SNS_TOPIC_ARN = os.getenv('SNS_TOPIC_ARN', '')
 GLUE_JOB_NAME = os.getenv('GLUE_JOB_NAME', '')
 
 
+def quarantine_object(bucket: str, source_key: str, quarantine_prefix: str) -> str:
+    """
+    Copy one file to the quarantine location and tag the original
+    """
+    quarantine_key = f"{quarantine_prefix}/{source_key}"
+    s3_client = get_client('s3')
+    
+    # Copy to logs bucket
+    copy_source = {'Bucket': bucket, 'Key': source_key}
+    s3_client.copy_object(
+        CopySource=copy_source,
+        Bucket=S3_LOGS_BUCKET,
+        Key=quarantine_key
+    )
+    
+    # Tag original file as quarantined (don't delete yet)
+    s3_client.put_object_tagging(
+        Bucket=bucket,
+        Key=source_key,
+        Tagging={'TagSet': [{'Key': 'Status', 'Value': 'Quarantined'}]}
+    )
+    
+    logger.info(f"Quarantined: {source_key} -> s3://{S3_LOGS_BUCKET}/{quarantine_key}")
+    return source_key
+
+
 def quarantine_data(bucket: str, prefix: str = "claims/") -> Dict:
     """
     Move suspicious data files to quarantine location (logs bucket)
@@ -60,106 +107,66 @@ def quarantine_data(bucket: str, prefix: str = "claims/") -> Dict:
         return {'status': 'skipped', 'reason': 'no_logs_bucket'}
     
     quarantined_files = []
+    failed_files = []
     
-    try:
-        logger.info(f"Quarantining data from s3://{bucket}/{prefix}")
-        
-        # List files in source bucket
-        response = s3_client.list_objects_v2(Bucket=bucket, Prefix=prefix)
-        
-        if 'Contents' not in response:
-            logger.info("No files found to quarantine")
-            return {'status': 'success', 'quarantined_count': 0, 'files': []}
-        
-        # Move files to quarantine location
-        for obj in response['Contents']:
-            source_key = obj['Key']
-            
-            # Skip directories
-            if source_key.endswith('/'):
-                continue
-            
-            # Create quarantine key with timestamp
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            quarantine_key = f"quarantine/{timestamp}/{source_key}"
-            
-            # Copy to logs bucket
-            copy_source = {'Bucket': bucket, 'Key': source_key}
-            s3_client.copy_object(
-                CopySource=copy_source,
-                Bucket=S3_LOGS_BUCKET,
-                Key=quarantine_key
-            )
-            
-            # Tag original file as quarantined (don't delete yet)
-            s3_client.put_object_tagging(
-                Bucket=bucket,
-                Key=source_key,
-                Tagging={'TagSet': [{'Key': 'Status', 'Value': 'Quarantined'}]}
-            )
-            
-            quarantined_files.append(source_key)
-            logger.info(f"Quarantined: {source_key} -> s3://{S3_LOGS_BUCKET}/{quarantine_key}")
-        
-        logger.info(f"Quarantined {len(quarantined_files)} files", 
-                   extra={'event_data': {'count': len(quarantined_files)}})
-        
+    def summary(status: str, **extra) -> Dict:
+        """Result with accurate succeeded/failed counts for the response and audit log"""
         return {
-            'status': 'success',
+            'status': status,
             'quarantined_count': len(quarantined_files),
-            'files': quarantined_files
-        }
-        
-    except ClientError as e:
-        logger.error(f"Error quarantining data: {str(e)}", extra={'event_data': {'error': str(e)}})
-        return {
-            'status': 'error',
-            'error': str(e),
-            'quarantined_count': len(quarantined_files)
+            'failed_count': len(failed_files),
+            'files': quarantined_files,
+            'failed_files': failed_files,
+            **extra
         }
-
-
-def restart_glue_job(job_name: str) -> Dict:
-    """
-    Restart AWS Glue job with graceful fallback
-    """
-    if not job_name:
-        logger.warning("No Glue job name configured")
-        return {'status': 'skipped', 'reason': 'no_job_name'}
     
     try:
-        glue_client = boto3.client('glue')
+        logger.info(f"Quarantining data from s3://{bucket}/{prefix}")
         
-        logger.info(f"Starting Glue job: {job_name}")
+        # One quarantine folder per run
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        quarantine_prefix = f"quarantine/{timestamp}"
         
-        # Start job run with default parameters
-        response = glue_client.start_job_run(
-            JobName=job_name,
-            Arguments={
-                '--S3_RAW_BUCKET': S3_RAW_BUCKET,
-                '--S3_PROCESSED_BUCKET': S3_PROCESSED_BUCKET,
-                '--S3_INPUT_KEY': 'claims/',  # Reprocess all claims
-                '--CLOUDWATCH_NAMESPACE': 'DQAD/DataQuality'
-            }
-        )
+        # Page through the source prefix; list_objects_v2 returns at most
+        # 1000 keys per call, so a single call would skip the rest
+        # (the S3 client is created here, before the worker threads use it)
+        paginator = get_client('s3').get_paginator('list_objects_v2')
+        pages = paginator.paginate(Bucket=bucket, Prefix=prefix, PaginationConfig={'PageSize': 1000})
         
-        job_run_id = response['JobRunId']
-        logger.info(f"Glue job started successfully", 
-                   extra={'event_data': {'job_name': job_name, 'job_run_id': job_run_id}})
+        # Copy/tag calls are latency-bound, so each page's keys run
+        # concurrently; results are collected before the next page is listed,
+        # so at most one page of futures is held at a time
+        with ThreadPoolExecutor(max_workers=MAX_QUARANTINE_WORKERS) as executor:
+            for page in pages:
+                futures = {
+                    executor.submit(quarantine_object, bucket, obj['Key'], quarantine_prefix): obj['Key']
+                    for obj in page.get('Contents', [])
+                    if not obj['Key'].endswith('/')  # Skip directories
+                }
+                # One failed key must not hide the outcome of the others
+                for future in as_completed(futures):
+                    try:
+                        quarantined_files.append(future.result())
+                    except ClientError as e:
+                        logger.error(f"Error quarantining {futures[future]}: {str(e)}")
+                        failed_files.append({'key': futures[future], 'error': str(e)})
         
-        return {
-            'status': 'success',
-            'job_name': job_name,
-            'job_run_id': job_run_id,
-            'action': 'glue_job_started'
-        }
+        if not quarantined_files and not failed_files:
+            logger.info("No files found to quarantine")
+            return summary('success')
         
-    except Exception as e:
-        logger.error(f"Error starting Glue job: {str(e)}", extra={'event_data': {'error': str(e)}})
-        return {
-            'status': 'error',
-            'error': str(e)
-        }
+        logger.info(f"Quarantined {len(quarantined_files)} files, {len(failed_files)} failed",
+                   extra={'event_data': {'count': len(quarantined_files), 'failed': len(failed_files)}})
+        
+        if not failed_files:
+            return summary('success')
+        return summary('partial' if quarantined_files else 'error',
+                       error=f"{len(failed_files)} files could not be quarantined")
+        
+    except ClientError as e:
+        # Listing failed; keys from pages already processed are still reported
+        logger.error(f"Error quarantining data: {str(e)}", extra={'event_data': {'error': str(e)}})
+        return summary('error', error=str(e))
 
 
 def restart_glue_job(job_name: str) -> Dict:
@@ -174,7 +181,7 @@ def restart_glue_job(job_name: str) -> Dict:
         logger.info(f"Starting Glue job: {job_name}")
         
         # Start job run with default parameters
-        response = glue_client.start_job_run(
+        response = get_client('glue').start_job_run(
             JobName=job_name,
             Arguments={
                 '--S3_RAW_BUCKET': S3_RAW_BUCKET,
@@ -201,13 +208,6 @@ def restart_glue_job(job_name: str) -> Dict:
             'status': 'error',
             'error': str(e)
         }
-        
-    except Exception as e:
-        logger.error(f"Error restarting job: {str(e)}", extra={'event_data': {'error': str(e)}})
-        return {
-            'status': 'error',
-            'error': str(e)
-        }
 
 
 def send_notification(subject: str, message: Dict):
@@ -217,7 +217,7 @@ def send_notification(subject: str, message: Dict):
         return
     
     try:
-        sns_client.publish(
+        get_client('sns').publish(
             TopicArn=SNS_TOPIC_ARN,
             Subject=subject,
             Message=json.dumps(message, indent=2, default=str)
@@ -227,27 +227,32 @@ def send_notification(subject: str, message: Dict):
         logger.error(f"Error sending notification: {str(e)}")
 
 
-def log_remediation_action(action: str, result: Dict):
-    """Log remediation action to S3 for audit trail"""
+def log_remediation_action(action: str, result: Dict, request_id: Optional[str] = None):
+    """Log remediation action to S3 for audit trail (gzipped JSON)"""
     if not S3_LOGS_BUCKET:
         return
     
     try:
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        log_key = f"remediation/{timestamp}_{action}.json"
+        now = datetime.now()
+        # The request id keeps keys unique when invocations share a second
+        suffix = f"_{request_id}" if request_id else ""
+        log_key = f"remediation/{now.strftime('%Y%m%d_%H%M%S')}_{action}{suffix}.json.gz"
         
         log_data = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': now.isoformat(),
             'action': action,
             'result': result,
             'environment': ENVIRONMENT
         }
         
-        s3_client.put_object(
+        # Quarantine results carry the full file list, so compress the body
+        get_client('s3').put_object(
             Bucket=S3_LOGS_BUCKET,
             Key=log_key,
-            Body=json.dumps(log_data, indent=2, default=str),
-            ContentType='application/json'
+            Body=gzip.compress(json.dumps(log_data, default=str).encode('utf-8')),
+            # A gzip file, not gzip transfer-encoded JSON, so clients keep the
+            # bytes compressed to match the .json.gz key
+            ContentType='application/gzip'
         )
         
         logger.info(f"Remediation logged to s3://{S3_LOGS_BUCKET}/{log_key}")
@@ -278,8 +283,10 @@ def lambda_handler(event, context):
         # Handle EventBridge/CloudWatch alarm trigger
         action = event.get('action', event.get('event_type', ''))
     
+    request_id = getattr(context, 'aws_request_id', None)
+    now_iso = datetime.now().isoformat()  # One timestamp per invocation
     results = {
-        'timestamp': datetime.now().isoformat(),
+        'timestamp': now_iso,
         'action': action,
         'success': False
     }
@@ -292,13 +299,14 @@ def lambda_handler(event, context):
             results['quarantine_result'] = quarantine_result
             results['success'] = quarantine_result.get('status') == 'success'
             
-            log_remediation_action('quarantine_data', quarantine_result)
+            log_remediation_action('quarantine_data', quarantine_result, request_id)
             
             send_notification(
                 'DQAD: Data Quarantined',
                 {
                     'action': 'quarantine_data',
                     'quarantined_count': quarantine_result.get('quarantined_count', 0),
+                    'failed_count': quarantine_result.get('failed_count', 0),
                     'result': quarantine_result
                 }
             )
@@ -311,7 +319,7 @@ def lambda_handler(event, context):
             results['restart_result'] = restart_result
             results['success'] = restart_result.get('status') == 'success'
             
-            log_remediation_action('restart_job', restart_result)
+            log_remediation_action('restart_job', restart_result, request_id)
             
             send_notification(
                 'DQAD: ETL Job Restarted',
@@ -328,10 +336,10 @@ def lambda_handler(event, context):
             cost_event = {
                 'alarm_name': event.get('alarm_name', 'unknown'),
                 'reason': event.get('reason', 'Cost threshold exceeded'),
-                'timestamp': event.get('timestamp', datetime.now().isoformat())
+                'timestamp': event.get('timestamp', now_iso)
             }
             
-            log_remediation_action('cost_spike_detected', cost_event)
+            log_remediation_action('cost_spike_detected', cost_event, request_id)
             
             send_notification(
                 'DQAD: Cost Spike Detected',
@@ -3,13 +3,37 @@ Update Glue ETL job script in S3
 This uploads the updated dqad_etl_job.py to S3 so Glue uses the new version
 """
 
+import hashlib
 import boto3
+from botocore.exceptions import ClientError
 from pathlib import Path
 
 # Configuration
 S3_BUCKET = "dqad-processed-dev"
 GLUE_SCRIPT_PATH = Path("../glue/dqad_etl_job.py")
 S3_KEY = "scripts/dqad_etl_job.py"
+HASH_CHUNK_SIZE = 1 << 20  # Read the script in 1 MB chunks when hashing
+
+def file_digests(path):
+    """Return (sha256, md5) hex digests of a file, read in one pass"""
+    sha256, md5 = hashlib.sha256(), hashlib.md5()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            sha256.update(chunk)
+            md5.update(chunk)
+    return sha256.hexdigest(), md5.hexdigest()
+
+def is_unchanged(s3, sha256, md5):
+    """Check whether the object in S3 already has the local file's contents"""
+    try:
+        response = s3.head_object(Bucket=S3_BUCKET, Key=S3_KEY)
+    except ClientError:
+        return False
+    # Uploads from this script carry sha256 metadata; for anything else (e.g. the
+    # Terraform upload) a single-part ETag is the MD5 of the body
+    if 'sha256' in response.get('Metadata', {}):
+        return response['Metadata']['sha256'] == sha256
+    return response['ETag'].strip('"') == md5
 
 def main():
     print("=" * 50)
@@ -30,13 +54,14 @@ def main():
     print(f"  Target: s3://{S3_BUCKET}/{S3_KEY}")
     
     try:
-        with open(GLUE_SCRIPT_PATH, 'rb') as f:
-            s3.put_object(
-                Bucket=S3_BUCKET,
-                Key=S3_KEY,
-                Body=f.read()
-            )
-        print("[OK] Script uploaded successfully")
+        sha256, md5 = file_digests(GLUE_SCRIPT_PATH)
+        if is_unchanged(s3, sha256, md5):
+            print("[OK] Script unchanged in S3, skipping upload")
+        else:
+            # upload_file streams from disk (multipart for large files)
+            s3.upload_file(str(GLUE_SCRIPT_PATH), S3_BUCKET, S3_KEY,
+                           ExtraArgs={'Metadata': {'sha256': sha256}})
+            print("[OK] Script uploaded successfully")
         print()
     except FileNotFoundError:
         print(f"[X] File not found: {GLUE_SCRIPT_PATH}")